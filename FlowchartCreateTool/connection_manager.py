@@ -16,6 +16,9 @@ class ConnectionManager:
             node_manager: 节点管理器实例，用于查找节点信息
         """
         self.connections = []  # 存储所有连接
+        # 已添加连接的 (起点ID, 起点类型, 终点ID, 终点类型) 键集合
+        # 连接可能被外部直接移除，因此该集合只作为“一定不存在”的快速判断
+        self._connection_keys = set()
         self.node_manager = node_manager
     
     def add_connection(self, start_node_id: str, start_point_type: str,
@@ -41,13 +44,15 @@ class ConnectionManager:
         if start_node and start_node["type"] == "start" and start_node["text"] == "结束":
             return  # 结束节点不应该有任何指出的连接
         
-        # 检查连接是否已存在
-        for conn in self.connections:
-            if (conn["start_item_id"] == start_node_id and
-                    conn["start_point_type"] == start_point_type and
-                    conn["end_item_id"] == end_node_id and
-                    conn["end_point_type"] == end_point_type):
-                return
+        # 检查连接是否已存在：键不在集合中则必然不存在，否则再确认列表
+        connection_key = (start_node_id, start_point_type, end_node_id, end_point_type)
+        if connection_key in self._connection_keys:
+            for conn in self.connections:
+                if (conn["start_item_id"] == start_node_id and
+                        conn["start_point_type"] == start_point_type and
+                        conn["end_item_id"] == end_node_id and
+                        conn["end_point_type"] == end_point_type):
+                    return
         
         # 确定连接线的标签（如果未提供）
         if label is None:
@@ -68,6 +73,7 @@ class ConnectionManager:
             "label": label
         }
         self.connections.append(connection)
+        self._connection_keys.add(connection_key)
     
     def connection_exists(self, start_node_id: str, end_node_id: str) -> bool:
         """
@@ -113,6 +119,7 @@ class ConnectionManager:
     def reset(self):
         """重置连接管理器状态"""
         self.connections = []
+        self._connection_keys = set()
     
     def get_all_connections(self) -> List[Dict[str, Any]]:
         """
@@ -4,7 +4,7 @@ if-else及嵌套结构处理模块
 """
 from typing import Dict, Any, List, Tuple
 from logger.logger import logger
-from ..utils import find_all_nested_if_else, find_parent_block
+from ..utils import find_all_nested_if_else, find_parent_block, contains_any_lower
 
 
 class IfElseProcessor:
@@ -271,12 +271,12 @@ class IfElseProcessor:
                 
                 # 检查当前上下文语句的类型
                 ctx_tag = ctx_statement.get("tag", "") if ctx_statement else ""
-                ctx_original = ctx_statement.get("original_unit", "").lower() if ctx_statement else ""
+                ctx_original = ctx_statement.get("original_unit", "") if ctx_statement else ""
                 ctx_type = ctx_statement.get("type", "") if ctx_statement else ""
                 
                 # 如果是循环
                 if ctx_context_type == 'loop' or (ctx_statement and (
-                    "for" in ctx_original or "while" in ctx_original or 
+                    contains_any_lower(ctx_original, "for", "while") or 
                     ctx_tag in ["loop"] or 
                     ctx_type in ["for_block", "while_block", "while_true_block"])):
                     # **改进**：不立即返回循环节点，先检查该循环中是否有后续语句
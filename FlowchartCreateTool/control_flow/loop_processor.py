@@ -4,7 +4,7 @@
 """
 from typing import Dict, Any
 from logger.logger import logger
-from ..utils import count_statement_chain
+from ..utils import count_statement_chain, contains_any_lower
 
 
 class LoopProcessor:
@@ -79,12 +79,11 @@ class LoopProcessor:
                     if "children" in child:
                         for grandchild in child["children"]:
                             if isinstance(grandchild, dict):
-                                original_unit = grandchild.get("original_unit", "").lower()
+                                original_unit = grandchild.get("original_unit", "")
                                 tag = grandchild.get("tag")
                                 type_ = grandchild.get("type")
                                 # 检查是否包含if或while关键字或条件标签
-                                if ("if" in original_unit or 
-                                    "while" in original_unit or
+                                if (contains_any_lower(original_unit, "if", "while") or
                                     tag in ["condition", "branch", "loop"] or
                                     type_ in ["if_block", "while_block", "while_true_block"]):
                                     logger.debug(f"循环体发现条件语句: {original_unit}")
@@ -182,12 +181,11 @@ class LoopProcessor:
         for next_idx in range(loop_index + 1, len(input_json)):
             next_item = input_json[next_idx]
             if next_item.get("tag") != "block":
-                original_unit = next_item.get("original_unit", "").lower()
+                original_unit = next_item.get("original_unit", "")
                 tag = next_item.get("tag")
                 logger.debug(f"检查后续语句: {original_unit}, tag: {tag}")
                 # 检查是否包含if或while关键字或条件标签
-                if ("if" in original_unit or 
-                    "while" in original_unit or
+                if (contains_any_lower(original_unit, "if", "while") or
                     tag in ["condition", "branch", "loop"]):
                     logger.debug(f"发现条件语句: {original_unit}")
                     return True
@@ -4,13 +4,23 @@
 """
 import json
 from typing import Dict, Any, List, Tuple
-from logger.logger import logger
+from logger.logger import logger, DEBUG
 
 from .node_manager import NodeManager
 from .connection_manager import ConnectionManager
 from .context_manager import ContextManager
 from .control_flow import IfElseProcessor, LoopProcessor
-from .utils import is_statement_in_loop, count_statement_chain
+from .utils import is_statement_in_loop, count_statement_chain, contains_any_lower
+
+# 语句tag到节点类型的映射，未列出的tag均为处理框
+_NODE_TYPE_BY_TAG = {
+    "i/o": "input",
+    "condition": "decision",
+    "branch": "decision",
+    "loop": "decision"
+}
+# 分支结构tag（需要在所有分支之后调整后续语句位置）
+_BRANCH_TAGS = frozenset({"condition", "branch"})
 
 
 class FlowchartConverter:
@@ -125,8 +135,8 @@ class FlowchartConverter:
     
     def _is_loop_structure(self, item: Dict[str, Any]) -> bool:
         """判断是否为循环结构"""
-        return (("for" in item.get("original_unit", "") or 
-                "while" in item.get("original_unit", "").lower()) and 
+        original_unit = item.get("original_unit", "")
+        return (("for" in original_unit or contains_any_lower(original_unit, "while")) and 
                item.get("tag") in ["condition", "loop"])
     
     def _process_loop_structure(self, item: Dict[str, Any], index: int,
@@ -138,7 +148,7 @@ class FlowchartConverter:
         返回: (current_node, current_y)
         """
         is_for = "for" in item.get("original_unit", "")
-        is_while = "while" in item.get("original_unit", "").lower()
+        is_while = contains_any_lower(item.get("original_unit", ""), "while")
         
         if is_for:
             return self._process_for_loop(item, current_node, current_y)
@@ -249,19 +259,26 @@ class FlowchartConverter:
     def _calculate_while_statement_chain(self, item: Dict[str, Any]) -> int:
         """计算while循环内最长的语句链数量"""
         max_statement_chain = 0
+        # 逐节点调试日志仅在DEBUG级别启用时才格式化
+        debug_enabled = logger.is_enabled_for(DEBUG)
         
         if "children" in item:
-            logger.debug(f"while循环有子节点: {len(item['children'])}")
+            if debug_enabled:
+                logger.debug(f"while循环有子节点: {len(item['children'])}")
             for child in item["children"]:
                 if isinstance(child, dict):
-                    logger.debug(f"子节点类型: {child.get('type')}")
+                    if debug_enabled:
+                        logger.debug(f"子节点类型: {child.get('type')}")
                     if child.get('type') in ["while_true_block", "while_block", "body"]:
-                        logger.debug(f"找到循环体: {child.get('type')}")
+                        if debug_enabled:
+                            logger.debug(f"找到循环体: {child.get('type')}")
                         if "children" in child:
-                            logger.debug(f"循环体有子节点: {len(child['children'])}")
+                            if debug_enabled:
+                                logger.debug(f"循环体有子节点: {len(child['children'])}")
                             for grandchild in child["children"]:
                                 if isinstance(grandchild, dict) and grandchild.get('tag') != 'block':
-                                    logger.debug(f"循环体内语句: {grandchild.get('original_unit') or grandchild.get('translated')}")
+                                    if debug_enabled:
+                                        logger.debug(f"循环体内语句: {grandchild.get('original_unit') or grandchild.get('translated')}")
                                     chain_length = count_statement_chain(grandchild)
                                     if chain_length > max_statement_chain:
                                         max_statement_chain = chain_length
@@ -323,8 +340,8 @@ class FlowchartConverter:
                 prev_item = input_json[prev_idx] if prev_idx < len(input_json) else None
                 if prev_item and isinstance(prev_item, dict):
                     prev_tag = prev_item.get("tag", "")
-                    prev_orig = prev_item.get("original_unit", "").lower()
-                    if ("for" in prev_orig or "while" in prev_orig or prev_tag in ["loop", "condition"]):
+                    prev_orig = prev_item.get("original_unit", "")
+                    if (contains_any_lower(prev_orig, "for", "while") or prev_tag in ["loop", "condition"]):
                         loop_condition_node = self.context_manager.get_loop_condition_node(prev_item)
                         if not loop_condition_node:
                             loop_condition_node = self.context_manager.get_statement_first_node(prev_idx)
@@ -524,8 +541,8 @@ class FlowchartConverter:
         for loop_idx, loop_item in enumerate(input_json):
             if isinstance(loop_item, dict):
                 loop_tag = loop_item.get("tag", "")
-                loop_orig = loop_item.get("original_unit", "").lower()
-                if ("for" in loop_orig or "while" in loop_orig or loop_tag in ["loop", "condition"]):
+                loop_orig = loop_item.get("original_unit", "")
+                if (contains_any_lower(loop_orig, "for", "while") or loop_tag in ["loop", "condition"]):
                     if "children" in loop_item:
                         for child in loop_item.get("children", []):
                             if isinstance(child, dict):
@@ -546,8 +563,8 @@ class FlowchartConverter:
             prev_item = parent_block[prev_idx] if prev_idx < len(parent_block) else None
             if prev_item and isinstance(prev_item, dict):
                 prev_tag = prev_item.get("tag", "")
-                prev_orig = prev_item.get("original_unit", "").lower()
-                if ("for" in prev_orig or "while" in prev_orig or prev_tag in ["loop"]):
+                prev_orig = prev_item.get("original_unit", "")
+                if (contains_any_lower(prev_orig, "for", "while") or prev_tag in ["loop"]):
                     loop_condition_node = self.context_manager.get_loop_condition_node(prev_item)
                     if not loop_condition_node:
                         if parent_block == input_json:
@@ -1143,7 +1160,7 @@ class FlowchartConverter:
             # **严格过滤**：跳过自己、开始、结束节点
             if not node_id or node_id == orphan_id or node.get('text') in ['开始', '结束']:
                 # 调试：如果是自己，记录一下
-                if node_id == orphan_id:
+                if node_id == orphan_id and logger.is_enabled_for(DEBUG):
                     logger.debug(f"  [过滤] 跳过自己: {node_id}")
                 continue
             
@@ -1240,12 +1257,11 @@ class FlowchartConverter:
         right_candidates = [(n, s, y) for n, s, y in right_candidates if n.get('id') != orphan_id]
         
         orphan_suffix = orphan['id'].split('_')[-1] if '_' in orphan['id'] else '?'
-        logger.debug(f"[查找目标] _{orphan_suffix}: down候选={len(down_candidates)}, right候选={len(right_candidates)}, from_decision_right={from_decision_right}")
-        if down_candidates:
+        if logger.is_enabled_for(DEBUG):
+            logger.debug(f"[查找目标] _{orphan_suffix}: down候选={len(down_candidates)}, right候选={len(right_candidates)}, from_decision_right={from_decision_right}")
             for i, (n, score, y_diff) in enumerate(down_candidates[:3]):
                 n_suffix = n['id'].split('_')[-1]
                 logger.debug(f"  down[{i}]: _{n_suffix}, y_diff={y_diff}, score={score:.1f}")
-        if right_candidates:
             for i, (n, score, y_diff) in enumerate(right_candidates[:3]):
                 n_suffix = n['id'].split('_')[-1]
                 logger.debug(f"  right[{i}]: _{n_suffix}, y_diff={y_diff}, score={score:.1f}")
@@ -1758,23 +1774,21 @@ class FlowchartConverter:
         参数:
             parent_loop_statement: 父循环语句（用于嵌套结构中传递循环信息）
         """
-        if statement.get("tag") == "block":
+        # tag/translated 只取一次，后续判断均复用局部变量
+        tag = statement.get("tag", "")
+        if tag == "block":
             return parent_node, False, x, y
         
         node_text = statement.get("translated", "")
-        node_type = "process"
         
-        # 根据tag确定节点类型
-        tag = statement.get("tag", "")
-        if tag == "i/o":
-            node_type = "input"
-        elif tag in ["condition", "branch", "loop"]:
-            if "while" in statement.get("original_unit", "") and tag == "loop":
-                node_type = "decision"
-            elif "else" in statement.get("original_unit", "") and node_text == "否则":
+        # 根据tag确定节点类型（查表）
+        node_type = _NODE_TYPE_BY_TAG.get(tag, "process")
+        
+        # 单独的else分支（先比较文本，命中时才做子串检查）
+        if node_type == "decision" and node_text == "否则":
+            original_unit = statement.get("original_unit", "")
+            if "else" in original_unit and not (tag == "loop" and "while" in original_unit):
                 return self._process_else_block(statement, x, y, parent_node)
-            else:
-                node_type = "decision"
         
         # 处理return语句
         if "return" in node_text or "返回" in node_text:
@@ -1813,7 +1827,7 @@ class FlowchartConverter:
         )
         
         # 确保后续语句在所有分支之后
-        if tag in ["condition", "branch"] and statement.get("children"):
+        if tag in _BRANCH_TAGS and statement.get("children"):
             next_y = self._adjust_y_after_branches(statement, y, next_y)
         
         self.node_manager.last_node = current_node
@@ -1964,12 +1978,12 @@ class FlowchartConverter:
         next_x = x
         next_y = y + self.level_height
         
-        if "children" not in statement or not statement["children"]:
+        children = statement.get("children")
+        if not children:
             return has_return, next_x, next_y
         
         # 特殊处理：switch 的 case 分支（children 中包含 type == 'case_block'）
         try:
-            children = statement.get("children", [])
             has_case_block = any(
                 isinstance(child, dict) and child.get("type") == "case_block"
                 for child in children
@@ -1982,28 +1996,31 @@ class FlowchartConverter:
                 statement, current_node, x, y, context_type, parent_block, parent_loop_statement
             )
         
-        for child in statement["children"]:
+        debug_enabled = logger.is_enabled_for(DEBUG)
+        for child in children:
             if isinstance(child, dict):
-                logger.debug(f"处理子节点: tag={child.get('tag')}, translated={child.get('translated')}, type={child.get('type')}")
+                if debug_enabled:
+                    logger.debug(f"处理子节点: tag={child.get('tag')}, translated={child.get('translated')}, type={child.get('type')}")
                 
                 if "type" in child:
-                    # 处理特殊类型的块
-                    if child["type"] == "if_block":
+                    # 处理特殊类型的块（type 只取一次）
+                    child_type = child["type"]
+                    if child_type == "if_block":
                         has_return, next_y = self._process_if_block(
                             child, statement, current_node, x, y, context_type, parent_block,
                             parent_loop_statement
                         )
-                    elif child["type"] == "else_block":
+                    elif child_type == "else_block":
                         has_return, next_y = self._process_else_block_in_statement(
                             child, statement, current_node, x, y, context_type, parent_block,
                             parent_loop_statement
                         )
-                    elif child["type"] == "while_true_block":
+                    elif child_type == "while_true_block":
                         # **关键修复**：传递statement（while语句）作为parent_loop_statement
                         next_y = self._process_while_block_in_statement(
                             child, current_node, x, y, parent_statement=statement
                         )
-                    elif child["type"] == "for_true_block":
+                    elif child_type == "for_true_block":
                         # **关键修复**：传递statement（for语句）作为parent_loop_statement
                         next_y = self._process_for_block_in_statement(
                             child, current_node, x, y, parent_statement=statement
@@ -2255,6 +2272,7 @@ class FlowchartConverter:
         
         has_next_if_in_n_statements = False
         counted_statements = 0
+        debug_enabled = logger.is_enabled_for(DEBUG)
         
         def check_statements(stmts, max_count, is_else_block=False):
             nonlocal counted_statements, has_next_if_in_n_statements
@@ -2269,7 +2287,8 @@ class FlowchartConverter:
                 counted_statements += 1
                 stmt_type = stmt.get('type', 'unknown')
                 stmt_tag = stmt.get('tag', 'unknown')
-                logger.debug(f"从if模块结束后计数: 第{counted_statements}条语句 - 类型: {stmt_type}, 标签: {stmt_tag}")
+                if debug_enabled:
+                    logger.debug(f"从if模块结束后计数: 第{counted_statements}条语句 - 类型: {stmt_type}, 标签: {stmt_tag}")
                 
                 if stmt != statement and stmt_type in ['if_block', 'while_block', 'while_true_block']:
                     has_next_if_in_n_statements = True
@@ -2309,8 +2328,7 @@ class FlowchartConverter:
             return 'main'
         
         # 检查是否在循环中
-        if any("for" in stmt.get("original_unit", "").lower() or 
-               "while" in stmt.get("original_unit", "").lower() or
+        if any(contains_any_lower(stmt.get("original_unit", ""), "for", "while") or
                stmt.get("tag") == "loop"
                for stmt in parent_block if isinstance(stmt, dict)):
             return 'loop'
@@ -2455,8 +2473,8 @@ class FlowchartConverter:
                 for loop_item in self.context_manager.input_json or []:
                     if isinstance(loop_item, dict):
                         loop_tag = loop_item.get("tag", "")
-                        loop_orig = loop_item.get("original_unit", "").lower()
-                        if ("for" in loop_orig or "while" in loop_orig or loop_tag in ["loop", "condition"]):
+                        loop_orig = loop_item.get("original_unit", "")
+                        if (contains_any_lower(loop_orig, "for", "while") or loop_tag in ["loop", "condition"]):
                             if is_statement_in_loop(statement, loop_item):
                                 loop_condition_node = self.context_manager.get_loop_condition_node(loop_item)
                                 if not loop_condition_node:
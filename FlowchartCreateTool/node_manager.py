@@ -11,6 +11,7 @@ class NodeManager:
     def __init__(self):
         """初始化节点管理器"""
         self.nodes = []  # 存储所有节点
+        self._nodes_by_id = {}  # 节点ID到节点的索引，与nodes同步维护
         self.node_counter = 0  # 节点计数器
         
         # 固定的节点ID模板
@@ -61,7 +62,7 @@ class NodeManager:
         node_id = self.get_unique_id(node_type)
         
         # 检查是否已经存在相同ID的节点
-        existing_node = next((n for n in self.nodes if n["id"] == node_id), None)
+        existing_node = self._nodes_by_id.get(node_id)
         if existing_node:
             # 如果存在，更新其属性
             existing_node["text"] = text
@@ -79,6 +80,7 @@ class NodeManager:
             "text": text
         }
         self.nodes.append(node)
+        self._nodes_by_id[node_id] = node
         return node
     
     def get_node_by_id(self, node_id: str) -> Dict[str, Any]:
@@ -91,11 +93,12 @@ class NodeManager:
         返回:
             Dict: 找到的节点，如果未找到则返回None
         """
-        return next((node for node in self.nodes if node["id"] == node_id), None)
+        return self._nodes_by_id.get(node_id)
     
     def reset(self):
         """重置节点管理器状态"""
         self.nodes = []
+        self._nodes_by_id = {}
         self.node_counter = 0
         self.start_node = None
         self.end_node = None
@@ -119,6 +122,8 @@ class NodeManager:
                         and node != self.end_node]
             # 从nodes列表中移除这些节点
             self.nodes = [node for node in self.nodes if node not in end_nodes]
+            for node in end_nodes:
+                self._nodes_by_id.pop(node["id"], None)
             return [node["id"] for node in end_nodes]  # 返回被移除节点的ID列表
         return []
 
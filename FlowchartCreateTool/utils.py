@@ -70,64 +70,86 @@ def is_statement_in_block(statement: Dict[str, Any], block: List[Dict[str, Any]]
 
 def find_all_nested_if_else(statement: Dict[str, Any], result: List[Dict[str, Any]]) -> None:
     """
-    递归查找所有嵌套的if-else结构
+    查找所有嵌套的if-else结构（显式栈迭代遍历，按先序追加，与递归顺序一致）
     
     参数:
         statement: 当前语句
         result: 结果列表，用于存储找到的所有if-else语句
     """
-    if not statement or not isinstance(statement, dict):
-        return
-    
-    # 如果当前语句是if-else结构，添加到结果中
-    if statement.get("tag") in ["condition", "branch"]:
-        if_block_info = statement.get("_if_block_info")
-        else_block_info = statement.get("_else_block_info")
-        if if_block_info or else_block_info:
-            result.append(statement)
-    
-    # 递归查找children中的所有嵌套if-else
-    if "children" in statement:
-        for child in statement["children"]:
+    stack = [statement]
+    while stack:
+        current = stack.pop()
+        if not current or not isinstance(current, dict):
+            continue
+        
+        # 如果当前语句是if-else结构，添加到结果中
+        if current.get("tag") in ("condition", "branch"):
+            if current.get("_if_block_info") or current.get("_else_block_info"):
+                result.append(current)
+        
+        # 收集待访问的子节点：if_block/else_block 展开其children，其余直接访问
+        pending = []
+        for child in current.get("children", ()):
             if isinstance(child, dict):
-                # 如果child是if_block或else_block，查找其children中的嵌套if-else
-                if child.get("type") in ["if_block", "else_block"]:
-                    if "children" in child:
-                        for grandchild in child["children"]:
-                            if isinstance(grandchild, dict):
-                                find_all_nested_if_else(grandchild, result)
+                if child.get("type") in ("if_block", "else_block"):
+                    pending.extend(gc for gc in child.get("children", ()) if isinstance(gc, dict))
                 else:
-                    # 否则直接递归
-                    find_all_nested_if_else(child, result)
+                    pending.append(child)
+        # 逆序入栈，使出栈顺序与递归访问顺序一致
+        stack.extend(reversed(pending))
 
 
 def count_statement_chain(node: Dict[str, Any], depth: int = 0) -> int:
     """
-    递归计算语句链长度
+    计算语句链长度（显式栈迭代遍历，取根到叶路径上的最长语句数）
     
     参数:
         node: 当前节点
-        depth: 当前深度
+        depth: 当前深度（保留参数，兼容旧调用）
         
     返回:
         int: 语句链的长度
     """
     local_max = 0
-    current_length = 1 if node.get('tag') != 'block' else 0
-    
-    if "children" in node and node["children"]:
-        for child in node["children"]:
-            if isinstance(child, dict):
-                # 递归计算子节点的语句链长度
-                child_max = count_statement_chain(child, depth + 1)
-                # 累加当前节点的长度和子节点最长链
-                local_max = max(local_max, current_length + child_max)
-    else:
-        local_max = current_length
+    stack = [(node, 0)]
+    while stack:
+        current, length_before = stack.pop()
+        current_length = length_before + (1 if current.get('tag') != 'block' else 0)
+        children = current.get("children")
+        if not children:
+            local_max = max(local_max, current_length)
+            continue
+        dict_children = [child for child in children if isinstance(child, dict)]
+        if dict_children:
+            stack.extend((child, current_length) for child in dict_children)
+        else:
+            # 子节点均非字典时，该节点本身不计入链长
+            local_max = max(local_max, length_before)
     
     return local_max
 
 
+def contains_any_lower(text: str, *keywords: str) -> bool:
+    """
+    不区分大小写地判断文本是否包含任一（小写）关键字
+    原串直接命中或原串已全为小写时，不生成小写副本
+    
+    参数:
+        text: 待检查的文本
+        keywords: 小写关键字
+        
+    返回:
+        bool: 包含任一关键字返回True，否则返回False
+    """
+    for keyword in keywords:
+        if keyword in text:
+            return True
+    if text.islower():
+        return False
+    lowered = text.lower()
+    return any(keyword in lowered for keyword in keywords)
+
+
 def find_parent_block(stmt: Dict[str, Any], current_block: List[Dict[str, Any]], 
                      current_idx: int) -> tuple:
     """
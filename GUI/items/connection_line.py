@@ -1,10 +1,16 @@
 """
 流程图连接线和标签类
 """
+import math
+
 from PyQt6.QtWidgets import QGraphicsTextItem, QGraphicsPathItem, QMenu
-from PyQt6.QtGui import QPen, QBrush, QFont, QPainterPath, QPolygonF, QVector2D
+from PyQt6.QtGui import QPen, QBrush, QFont, QPainterPath, QPolygonF
 from PyQt6.QtCore import Qt, QPointF
 from utils.config_manager import get_config
+from .constants import UP, DOWN, LEFT, RIGHT, POINT_CODES
+
+# 所有连接线共享的箭头画刷
+_ARROW_BRUSH = QBrush(Qt.GlobalColor.black)
 
 
 class ConnectionLabelItem(QGraphicsTextItem):
@@ -28,6 +34,8 @@ class ConnectionLine(QGraphicsPathItem):
         self.start_point_type = start_point_type
         self.end_item = end_item
         self.end_point_type = end_point_type
+        self.start_code = POINT_CODES.get(start_point_type)
+        self.end_code = POINT_CODES.get(end_point_type)
 
         # 从配置文件加载连接线设置
         line_width = get_config('connection', 'line', 'width', default=2)
@@ -48,6 +56,9 @@ class ConnectionLine(QGraphicsPathItem):
         self.label = None
         self.label_item = None
 
+        # 上次生成路径时的端点与场景状态，未变化时跳过重算
+        self._last_path_key = None
+
         # 检查是否需要自动添加默认标签
         self.check_default_label()
         
@@ -131,7 +142,9 @@ class ConnectionLine(QGraphicsPathItem):
             scene = self.scene()
             if scene and hasattr(scene, 'connections'):
                 self.remove_label()
-                if self in scene.connections:
+                if hasattr(scene, 'unregister_connection'):
+                    scene.unregister_connection(self)
+                elif self in scene.connections:
                     scene.connections.remove(self)
                 scene.removeItem(self)
         elif action_text == "添加\"是\"标签":
@@ -159,29 +172,32 @@ class ConnectionLine(QGraphicsPathItem):
         super().paint(painter, option, widget)
 
         path = self.path()
-        if path.isEmpty():
+        element_count = path.elementCount()
+        if element_count < 2:
             return
 
         # 获取路径的最后一段
         last_point = path.currentPosition()
-        penultimate_point = path.elementAt(path.elementCount() - 2)
-        penultimate_point = QPointF(penultimate_point.x, penultimate_point.y)
+        penultimate_point = path.elementAt(element_count - 2)
+        lx, ly = last_point.x(), last_point.y()
 
-        # 计算箭头方向
-        direction = last_point - penultimate_point
-        vector = QVector2D(direction)
-        vector.normalize()
-        direction = QPointF(vector.x(), vector.y())
+        # 计算箭头方向（单位向量，零长度时保持为零向量）
+        dx = lx - penultimate_point.x
+        dy = ly - penultimate_point.y
+        length = math.hypot(dx, dy)
+        if length:
+            dx /= length
+            dy /= length
 
         # 创建箭头多边形
-        arrow_polygon = QPolygonF()
-        arrow_polygon.append(last_point)
-        arrow_polygon.append(last_point - self.arrow_size * QPointF(direction.x() + direction.y(),
-                                                                    -direction.x() + direction.y()))
-        arrow_polygon.append(last_point - self.arrow_size * QPointF(direction.x() - direction.y(),
-                                                                    direction.x() + direction.y()))
-
-        painter.setBrush(QBrush(Qt.GlobalColor.black))
+        s = self.arrow_size
+        arrow_polygon = QPolygonF([
+            last_point,
+            QPointF(lx - s * (dx + dy), ly - s * (-dx + dy)),
+            QPointF(lx - s * (dx - dy), ly - s * (dx + dy)),
+        ])
+
+        painter.setBrush(_ARROW_BRUSH)
         painter.drawPolygon(arrow_polygon)
 
     def update_path(self):
@@ -189,41 +205,46 @@ class ConnectionLine(QGraphicsPathItem):
         if not (self.start_item and self.end_item):
             return
 
-        start_point = self.start_item.connection_points[self.start_point_type].scenePos()
-        end_point = self.end_item.connection_points[self.end_point_type].scenePos()
+        start_point = self.start_item.anchor_scene_pos(self.start_point_type)
+        end_point = self.end_item.anchor_scene_pos(self.end_point_type)
+
+        # 端点位置、所在场景及场景连接集合均未变化时，路径不会改变，直接返回
+        scene = self.scene()
+        path_key = (start_point.x(), start_point.y(), end_point.x(), end_point.y(),
+                    scene, getattr(scene, 'connections_version', 0))
+        if path_key == self._last_path_key:
+            return
+        self._last_path_key = path_key
 
         path = QPainterPath()
         path.moveTo(start_point)
 
-        is_end_decision = (self.end_item.item_type == 'decision')
-
-        # 根据连接类型生成不同路径
-        if (self.start_point_type == 'down' and self.end_point_type == 'up'):
-            self._draw_down_to_up_path(path, start_point, end_point)
-        elif (self.start_point_type == 'up' and self.end_point_type == 'down'):
-            self._draw_up_to_down_path(path, start_point, end_point)
-        elif (self.start_point_type == 'right' and self.end_point_type == 'left'):
-            path.lineTo(end_point)
-        elif (self.start_point_type == 'left' and self.end_point_type == 'right'):
-            self._draw_left_to_right_path(path, start_point, end_point)
-        elif (self.start_point_type == 'right' and self.end_point_type == 'right'):
-            self._draw_right_to_right_path(path, start_point, end_point)
-        elif (self.start_point_type == 'left' and self.end_point_type == 'left'):
-            self._draw_left_to_left_path(path, start_point, end_point)
-        elif self.start_point_type == 'down' and self.end_point_type in ('left', 'right'):
-            self._draw_down_to_side_path(path, start_point, end_point)
-        elif self.start_point_type == 'right' and self.end_point_type == 'up':
-            self._draw_right_to_up_path(path, start_point, end_point)
-        elif self.start_point_type == 'left' and self.end_point_type == 'up':
-            self._draw_left_to_up_path(path, start_point, end_point)
-        elif is_end_decision and self.end_point_type == 'up' and self.start_point_type == 'down':
-            self._draw_down_to_up_decision_path(path, start_point, end_point)
+        # 根据连接类型（起点、终点连接点编码）分派到对应的路径生成方法
+        router = self._ROUTERS.get((self.start_code, self.end_code))
+        if router is None:
+            self._draw_straight_path(path, start_point, end_point)
         else:
-            path.lineTo(end_point)
+            router(self, path, start_point, end_point)
 
         self.setPath(path)
         self.update_label_position()
 
+    def _connections_of(self, item):
+        """获取场景中与指定元素相关的连接线；场景没有连接索引时退回全部连接（调用方仍需按条件过滤）"""
+        scene = self.scene()
+        if not scene:
+            return ()
+        if hasattr(scene, 'get_item_connections'):
+            return scene.get_item_connections(item)
+        return getattr(scene, 'connections', ())
+
+    def _incoming_of(self, item, end_point_type, start_point_type):
+        """获取终点为指定元素的连接线；场景有分类索引时只返回两端类型匹配的连接（调用方仍需按条件过滤）"""
+        scene = self.scene()
+        if scene and hasattr(scene, 'get_incoming_connections'):
+            return scene.get_incoming_connections(item, end_point_type, start_point_type)
+        return self._connections_of(item)
+
     def _collect_function_items(self):
         """收集与当前连接属于同一函数块的元素"""
         scene = self.scene()
@@ -243,7 +264,7 @@ class ConnectionLine(QGraphicsPathItem):
 
         while queue:
             current = queue.pop(0)
-            for conn in scene.connections:
+            for conn in self._connections_of(current):
                 if not isinstance(conn, ConnectionLine):
                     continue
 
@@ -262,6 +283,11 @@ class ConnectionLine(QGraphicsPathItem):
 
     def _get_function_rightmost_x(self):
         """获取当前函数块内最右侧元素的X坐标"""
+        # 批量重算期间使用场景预先按函数块计算好的结果
+        cache = getattr(self.scene(), 'function_rightmost_cache', None)
+        if cache is not None and self.start_item in cache and self.end_item in cache:
+            return max(cache[self.start_item], cache[self.end_item])
+
         items = self._collect_function_items()
         rightmost = None
 
@@ -281,12 +307,12 @@ class ConnectionLine(QGraphicsPathItem):
         if end_point.y() > start_point.y():
             upper_block_down_y = None
             if self.scene():
-                for conn in self.scene().connections:
+                for conn in self._incoming_of(self.end_item, 'up', 'down'):
                     if (conn != self and 
                         conn.end_item == self.end_item and 
                         conn.end_point_type == 'up' and
                         conn.start_point_type == 'down'):
-                        upper_block_down_point = conn.start_item.connection_points['down'].scenePos()
+                        upper_block_down_point = conn.start_item.anchor_scene_pos('down')
                         upper_block_down_y = upper_block_down_point.y()
                         break
             
@@ -343,6 +369,10 @@ class ConnectionLine(QGraphicsPathItem):
         path.lineTo(end_point.x(), path.currentPosition().y())
         path.lineTo(end_point)
 
+    def _draw_straight_path(self, path, start_point, end_point):
+        """直接连接（right->left 及未定义路径的组合）"""
+        path.lineTo(end_point)
+
     def _draw_left_to_right_path(self, path, start_point, end_point):
         """left->right 直接连接"""
         path.lineTo(end_point)
@@ -364,6 +394,11 @@ class ConnectionLine(QGraphicsPathItem):
 
             if function_rightmost is not None:
                 rightmost_x = max(rightmost_x, function_rightmost)
+            elif self.scene() and hasattr(self.scene(), 'rightmost_x'):
+                # 使用场景缓存的元素最右边缘，避免逐项扫描
+                scene_rightmost = self.scene().rightmost_x()
+                if scene_rightmost is not None:
+                    rightmost_x = max(rightmost_x, scene_rightmost)
             elif self.scene():
                 for item in self.scene().items():
                     if hasattr(item, 'sceneBoundingRect'):
@@ -373,7 +408,7 @@ class ConnectionLine(QGraphicsPathItem):
             
             same_target_count = 0
             if self.scene():
-                for conn in self.scene().connections:
+                for conn in self._incoming_of(self.end_item, 'up', 'right'):
                     if (conn != self and 
                         conn.end_item == self.end_item and 
                         conn.end_point_type == 'up' and
@@ -405,15 +440,16 @@ class ConnectionLine(QGraphicsPathItem):
             path.lineTo(end_point.x(), start_point.y())
             path.lineTo(end_point)
 
-    def _draw_down_to_up_decision_path(self, path, start_point, end_point):
-        """down->up decision 连接路径"""
-        horizontal_offset = self.offsets.get('decision_loop', {}).get('horizontal_offset', 30)
-        mid_offset = self.offsets.get('decision_loop', {}).get('mid_offset', 40)
-        
-        mid_y = end_point.y() - mid_offset
-
-        path.lineTo(start_point.x() + horizontal_offset, start_point.y())
-        path.lineTo(path.currentPosition().x(), mid_y)
-        path.lineTo(end_point.x(), mid_y)
-        path.lineTo(end_point)
-
+    # (起点连接点编码, 终点连接点编码) -> 路径生成方法；未列出的组合直接连线
+    _ROUTERS = {
+        (DOWN, UP): _draw_down_to_up_path,
+        (UP, DOWN): _draw_up_to_down_path,
+        (RIGHT, LEFT): _draw_straight_path,
+        (LEFT, RIGHT): _draw_left_to_right_path,
+        (RIGHT, RIGHT): _draw_right_to_right_path,
+        (LEFT, LEFT): _draw_left_to_left_path,
+        (DOWN, LEFT): _draw_down_to_side_path,
+        (DOWN, RIGHT): _draw_down_to_side_path,
+        (RIGHT, UP): _draw_right_to_up_path,
+        (LEFT, UP): _draw_left_to_up_path,
+    }
@@ -7,6 +7,10 @@ from PyQt6.QtCore import Qt, QRectF
 from logger.logger import logger
 from utils.config_manager import get_config
 
+# 所有连接点共享的画刷与画笔
+_POINT_BRUSH = QBrush(Qt.GlobalColor.red)
+_POINT_PEN = QPen(Qt.GlobalColor.darkRed, 1)
+
 
 class ConnectionPoint(QGraphicsEllipseItem):
     """连接点类"""
@@ -20,23 +24,26 @@ class ConnectionPoint(QGraphicsEllipseItem):
         self.radius = get_config('item', 'connection_point', 'radius', default=5)
         self.hit_radius = get_config('item', 'connection_point', 'hit_radius', default=10)
         z_value = get_config('item', 'connection_point', 'z_value', default=10)
+
+        # 点击判定范围的矩形与形状只构建一次（需在setRect之前，setRect会调用boundingRect），shape()/boundingRect() 直接返回缓存
+        self._hit_rect = QRectF(-self.hit_radius, -self.hit_radius, self.hit_radius * 2, self.hit_radius * 2)
+        self._shape = QPainterPath()
+        self._shape.addEllipse(self._hit_rect)
         
         self.setRect(-self.radius, -self.radius, self.radius * 2, self.radius * 2)
-        self.setBrush(QBrush(Qt.GlobalColor.red))
-        self.setPen(QPen(Qt.GlobalColor.darkRed, 1))
+        self.setBrush(_POINT_BRUSH)
+        self.setPen(_POINT_PEN)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, True)
         self.setZValue(z_value)
 
     def shape(self):
         """重定义形状以增大点击判定范围"""
-        path = QPainterPath()
-        path.addEllipse(-self.hit_radius, -self.hit_radius, self.hit_radius * 2, self.hit_radius * 2)
-        return path
+        return self._shape
 
     def boundingRect(self):
         """重定义边界矩形以匹配增大的点击判定范围"""
-        return QRectF(-self.hit_radius, -self.hit_radius, self.hit_radius * 2, self.hit_radius * 2)
+        return self._hit_rect
 
     def update_position(self):
         """更新连接点位置"""
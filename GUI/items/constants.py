@@ -14,3 +14,7 @@ ITEM_TYPES = {
 # 连接点位置
 CONNECTION_POINTS = ['up', 'down', 'left', 'right']
 
+# 连接点位置的整数编码（用于路径计算的分派）
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+POINT_CODES = {'up': UP, 'down': DOWN, 'left': LEFT, 'right': RIGHT}
+
@@ -1,16 +1,36 @@
 """
 流程图元素类
 """
+import itertools
 import uuid
-from PyQt6.QtWidgets import QGraphicsItem, QGraphicsTextItem, QMenu, QApplication
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsTextItem, QMenu
 from PyQt6.QtGui import QPen, QBrush, QColor, QFont, QPainterPath
-from PyQt6.QtCore import Qt, QRectF
+from PyQt6.QtCore import Qt, QRectF, QPointF
 
 from .constants import CONNECTION_POINTS
 from .connection_point import ConnectionPoint
 from utils.config_manager import get_config
 from utils.color_utils import to_qcolor
 
+# 元素ID = 进程级随机前缀 + 递增计数：只需生成一次随机数，
+# 前缀保证本次会话新建的元素不会与从文件加载的元素ID冲突
+_ID_PREFIX = uuid.uuid4().hex[:12]
+_next_id = itertools.count(1).__next__
+
+# 所有元素共享的边框画笔，以及按配置颜色值缓存的填充画刷（QPen/QBrush为隐式共享，可直接复用）
+_SELECTED_PEN = QPen(QColor(0, 100, 255), 3)
+_BORDER_PEN = QPen(Qt.GlobalColor.black, 2)
+_FILL_BRUSHES = {}
+
+
+def _fill_brush(color_value):
+    """获取配置颜色值对应的填充画刷，相同颜色只创建一次"""
+    key = tuple(color_value) if isinstance(color_value, list) else color_value
+    brush = _FILL_BRUSHES.get(key)
+    if brush is None:
+        brush = _FILL_BRUSHES[key] = QBrush(to_qcolor(color_value, [240, 240, 240]))
+    return brush
+
 
 class FlowchartItem(QGraphicsItem):
     """流程图元素基类"""
@@ -18,15 +38,20 @@ class FlowchartItem(QGraphicsItem):
     def __init__(self, item_type, x, y, width=125, height=75):
         super().__init__()
         self.item_type = item_type
-        self.id = str(uuid.uuid4())
+        self.id = f'{_ID_PREFIX}-{_next_id()}'
         self.text = ""
-        self.setPos(x, y)
         self.width = width
         self.height = height
+        # 缓存边界矩形，boundingRect() 调用极其频繁，避免每次新建QRectF
+        self._bounding_rect = QRectF(0, 0, width, height)
+        self._rebuild_shape_path()
+        self.setPos(x, y)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges, True)
         self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsFocusable, True)
+        # 缓存渲染结果，拖动/平移时直接贴图而不是重新光栅化（内容变化时通过update()失效）
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
         # 创建连接点
         self.connection_points = {}
@@ -39,6 +64,8 @@ class FlowchartItem(QGraphicsItem):
         self._is_moving_with_group = False
         # 记录拖动开始时的位置（用于多选拖动）
         self._drag_start_position = None
+        # 上次文本布局所依据的尺寸、边距与文本，未变化时跳过重新布局
+        self._last_text_layout = None
 
         # 创建文本元素
         font_family = get_config('text', 'font_family', default='Arial')
@@ -47,39 +74,81 @@ class FlowchartItem(QGraphicsItem):
         self.text_item = QGraphicsTextItem(self)
         self.text_item.setDefaultTextColor(Qt.GlobalColor.black)
         self.text_item.setFont(QFont(font_family, font_size))
-        self.text_item.setHtml('<div align="center">' + self.text + '</div>')
+        # 通过文档默认选项居中，文本以纯文本设置，无需经过HTML解析
+        text_option = self.text_item.document().defaultTextOption()
+        text_option.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+        self.text_item.document().setDefaultTextOption(text_option)
         self.text_item.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
         self.text_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable, False)
         self.text_item.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable, False)
-
-        # 连接文本变化信号
-        self.text_item.document().contentsChanged.connect(self.update_text_position)
+        self.text_item.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        # 文本不接收鼠标与悬停事件，点击直接落到元素本身
+        self.text_item.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.text_item.setAcceptHoverEvents(False)
 
         self.update_connection_points()
         self.update_text_position()
 
     def boundingRect(self):
-        """重定义边界矩形"""
-        return QRectF(0, 0, self.width, self.height)
+        """重定义边界矩形（返回缓存的矩形，调用方不应修改）"""
+        return self._bounding_rect
+
+    def fast_scene_rect(self):
+        """元素在场景中的矩形（元素不做旋转缩放，直接由位置与尺寸得出，不经过Qt的坐标映射）"""
+        return QRectF(self.x(), self.y(), self.width, self.height)
+
+    def anchor_scene_pos(self, point_type):
+        """连接点在场景中的位置（各边中点），与对应ConnectionPoint的scenePos()一致但无需访问子项"""
+        x, y = self.x(), self.y()
+        if point_type == 'up':
+            return QPointF(x + self.width / 2, y)
+        if point_type == 'down':
+            return QPointF(x + self.width / 2, y + self.height)
+        if point_type == 'left':
+            return QPointF(x, y + self.height / 2)
+        return QPointF(x + self.width, y + self.height / 2)
+
+    def set_size(self, width, height):
+        """修改元素尺寸，并同步缓存的边界矩形、连接点与文本位置"""
+        self.prepareGeometryChange()
+        self.width = width
+        self.height = height
+        self._bounding_rect = QRectF(0, 0, width, height)
+        self._rebuild_shape_path()
+        self.update_connection_points()
+        self.update_text_position()
+        self.update()
 
     def paint(self, painter, option, widget=None):
         """绘制流程图元素"""
         # 根据选中状态设置边框颜色
         if self.isSelected():
-            painter.setPen(QPen(QColor(0, 100, 255), 3))  # 选中时蓝色边框，稍粗
+            painter.setPen(_SELECTED_PEN)  # 选中时蓝色边框，稍粗
         else:
-            painter.setPen(QPen(Qt.GlobalColor.black, 2))  # 未选中时黑色边框
+            painter.setPen(_BORDER_PEN)  # 未选中时黑色边框
 
         colors_config = get_config('item', 'colors', default={}) or {}
         fill_color_value = colors_config.get(self.item_type, colors_config.get('default', [240, 240, 240]))
-        painter.setBrush(QBrush(to_qcolor(fill_color_value, [240, 240, 240])))
-
-        rect = self.boundingRect()
-
-        # 根据类型绘制不同形状
+        painter.setBrush(_fill_brush(fill_color_value))
+
+        # 根据缓存的形状类别绘制
+        shape_kind = self._shape_kind
+        if shape_kind == 'path':
+            painter.drawPath(self._shape_path)
+        elif shape_kind == 'rounded':
+            painter.drawRoundedRect(self._bounding_rect, self._round_radius, self._round_radius)
+        elif shape_kind == 'rect':
+            painter.drawRect(self._bounding_rect)
+
+    def _rebuild_shape_path(self):
+        """根据类型与尺寸重建轮廓（菱形/平行四边形路径只在尺寸或类型变化时构建）"""
+        rect = self._bounding_rect
+        self._shape_path = None
+        self._round_radius = 0
         if self.item_type == 'start' or self.item_type == 'end':
             # 跑道形状
-            painter.drawRoundedRect(rect, rect.height() / 2, rect.height() / 2)
+            self._shape_kind = 'rounded'
+            self._round_radius = rect.height() / 2
         elif self.item_type == 'input':
             # 平行四边形
             path = QPainterPath()
@@ -89,10 +158,11 @@ class FlowchartItem(QGraphicsItem):
             path.lineTo(rect.right() - offset, rect.bottom())
             path.lineTo(rect.left(), rect.bottom())
             path.closeSubpath()
-            painter.drawPath(path)
+            self._shape_kind = 'path'
+            self._shape_path = path
         elif self.item_type == 'process':
             # 矩形
-            painter.drawRect(rect)
+            self._shape_kind = 'rect'
         elif self.item_type == 'decision':
             # 菱形
             path = QPainterPath()
@@ -101,7 +171,10 @@ class FlowchartItem(QGraphicsItem):
             path.lineTo(rect.center().x(), rect.bottom())
             path.lineTo(rect.left(), rect.center().y())
             path.closeSubpath()
-            painter.drawPath(path)
+            self._shape_kind = 'path'
+            self._shape_path = path
+        else:
+            self._shape_kind = None
 
     def contextMenuEvent(self, event):
         """右键菜单事件"""
@@ -141,8 +214,10 @@ class FlowchartItem(QGraphicsItem):
                 items_to_remove = selected_items if len(selected_items) > 1 else [self]
                 connections_to_remove = []
                 
+                has_index = hasattr(scene, 'get_item_connections')
                 for item in items_to_remove:
-                    for connection in scene.connections:
+                    item_connections = scene.get_item_connections(item) if has_index else scene.connections
+                    for connection in item_connections:
                         if connection.start_item == item or connection.end_item == item:
                             if connection not in connections_to_remove:
                                 connections_to_remove.append(connection)
@@ -153,7 +228,9 @@ class FlowchartItem(QGraphicsItem):
                     if hasattr(connection, "remove_label"):
                         connection.remove_label()
                     scene.removeItem(connection)
-                    if connection in scene.connections:
+                    if has_index:
+                        scene.unregister_connection(connection)
+                    elif connection in scene.connections:
                         scene.connections.remove(connection)
 
                 # 删除所有选中的元素
@@ -169,6 +246,10 @@ class FlowchartItem(QGraphicsItem):
         """更新文本位置"""
         if self.text_item:
             text_margin = get_config('text', 'text_margin', default=10)
+            layout_key = (self.width, self.height, text_margin, self.text_item.toPlainText())
+            if layout_key == self._last_text_layout:
+                return
+            self._last_text_layout = layout_key
             double_margin = text_margin * 2
             
             item_rect = self.boundingRect()
@@ -193,10 +274,9 @@ class FlowchartItem(QGraphicsItem):
     def setText(self, text):
         """设置文本"""
         self.text = text
-        # HTML转义
-        escaped_text = text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        self.text_item.setHtml('<div align="center">' + escaped_text + '</div>')
+        self.text_item.setPlainText(text)
         self.update_text_position()
+        self.update()
 
     def mousePressEvent(self, event):
         """鼠标按下事件"""
@@ -261,22 +341,6 @@ class FlowchartItem(QGraphicsItem):
         self.text_item.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
         super().focusOutEvent(event)
 
-    def sceneEventFilter(self, watched, event):
-        """事件过滤器"""
-        if watched == self.text_item:
-            if event.type() == event.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
-                new_event = type(event)(
-                    event.type(),
-                    self.mapFromScene(event.scenePos()),
-                    event.button(),
-                    event.buttons(),
-                    event.modifiers()
-                )
-                QApplication.postEvent(self, new_event)
-                return True
-
-        return super().sceneEventFilter(watched, event)
-
     def itemChange(self, change, value):
         """处理项目变化"""
         if change == QGraphicsItem.GraphicsItemChange.ItemSelectedChange:
@@ -306,9 +370,12 @@ class FlowchartItem(QGraphicsItem):
                                 item._is_moving_with_group = False
         
         if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
-            self.update_connection_points()
+            # 连接点是子项，位置相对元素自身，只随尺寸变化（见set_size），移动时无需重新定位
             scene = self.scene()
-            if scene and hasattr(scene, 'connections'):
+            if scene and hasattr(scene, 'schedule_item_update'):
+                # 交给场景按帧合并刷新相关连接与画布大小
+                scene.schedule_item_update(self)
+            elif scene and hasattr(scene, 'connections'):
                 for connection in scene.connections:
                     if connection.start_item == self or connection.end_item == self:
                         connection.update_path()
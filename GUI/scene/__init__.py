@@ -2,6 +2,7 @@
 流程图场景模块
 """
 from .flowchart_scene import FlowchartScene
+from .grid_background_item import GridBackgroundItem
 
-__all__ = ['FlowchartScene']
+__all__ = ['FlowchartScene', 'GridBackgroundItem']
 
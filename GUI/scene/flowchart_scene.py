@@ -1,13 +1,32 @@
 """
 流程图场景类
 """
+from collections import defaultdict
+
 from PyQt6.QtWidgets import QGraphicsScene, QMessageBox
-from PyQt6.QtGui import QBrush, QColor, QPen, QTransform
-from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QBrush, QColor, QTransform, QPainterPath
+from PyQt6.QtCore import Qt, QTimer, QRectF
 
 from GUI.items import FlowchartItem, ConnectionPoint, ConnectionLine
 from utils.config_manager import get_config
+from .grid_background_item import GridBackgroundItem
 from utils.color_utils import to_qcolor, normalize_color
+from logger.logger import logger, DEBUG
+
+# 允许的连接方式 (起点连接点类型, 终点连接点类型)。
+# 判断结构的 left/right/down -> up 特殊规则已被通用规则覆盖，因此与终点元素类型无关
+_VALID_CONNECTIONS = frozenset({
+    # 直接连接规则
+    ('down', 'up'), ('right', 'left'), ('right', 'right'), ('left', 'left'),
+    # 其他连接规则
+    ('left', 'up'), ('right', 'up'),
+    ('left', 'right'),
+    ('down', 'left'), ('down', 'right'),
+})
+
+# 连接点的常态画刷与作为连线起点时的高亮画刷
+_POINT_BRUSH = QBrush(Qt.GlobalColor.red)
+_START_POINT_BRUSH = QBrush(Qt.GlobalColor.blue)
 
 
 class FlowchartScene(QGraphicsScene):
@@ -15,9 +34,35 @@ class FlowchartScene(QGraphicsScene):
 
     def __init__(self):
         super().__init__()
+        # 不使用BSP树索引：元素在编辑中频繁移动，BSP索引需要反复维护；
+        # 流程图通常只有几十到几百个元素，itemAt/绘制时线性遍历的开销更低
+        self.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
         self.connections = []
+        # 按元素索引的连接线（起点或终点为该元素），避免每次都扫描全部连接
+        self.connections_by_item = defaultdict(list)
+        # 按 (终点元素, 终点连接点类型, 起点连接点类型) 索引的连接线，供路径计算中的同类连接查询
+        self.incoming_by_kind = defaultdict(list)
+        # 连接集合的版本号，连接增删时递增（连接线据此判断路径缓存是否失效）
+        self.connections_version = 0
         self.start_connection = None
 
+        # 场景中的流程图元素及其最右边缘缓存（元素增删或移动时标记失效）
+        self.flow_items = set()
+        self._rightmost_x = None
+        self._rightmost_x_dirty = True
+        # 批量重算路径期间，元素 -> 所在函数块（连通分量）最右边缘X坐标的缓存；平时为None
+        self.function_rightmost_cache = None
+
+        # 拖动时待刷新的连接线与移动过的元素（用于判断画布边界），由定时器按帧合并处理
+        self._dirty_connections = set()
+        self._moved_items = set()
+        # 刷新时位于所有视图可见区域之外的连接线，待其进入可见区域后再重算路径
+        self._offscreen_connections = set()
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(16)
+        self._flush_timer.timeout.connect(self._flush_dirty)
+
         # 从配置文件加载画布参数
         self.scene_origin_x = get_config('scene', 'origin_x', default=-5000)
         self.scene_origin_y = get_config('scene', 'origin_y', default=-5000)
@@ -27,6 +72,8 @@ class FlowchartScene(QGraphicsScene):
         self.current_max_height = self.min_height
         self.padding = get_config('scene', 'padding', default=500)
         self.batch_loading = False
+        # 已知内容范围的累积外接矩形（画布只增大不减小，因此只需合并、无需在删除时收缩）
+        self._items_rect = QRectF()
 
         # 设置初始画布范围
         self.setSceneRect(self.scene_origin_x, self.scene_origin_y, 
@@ -41,98 +88,290 @@ class FlowchartScene(QGraphicsScene):
         self.grid_color = normalize_color(grid_color_value, [200, 200, 200])
         self.grid_qcolor = QColor(*self.grid_color)
 
+        # 背景网格作为带缓存的最底层图元绘制，范围始终与画布一致
+        self.grid_item = GridBackgroundItem()
+        self.grid_item.set_rect(self.sceneRect())
+        self.addItem(self.grid_item)
+        self.sceneRectChanged.connect(self.grid_item.set_rect)
+
     def drawBackground(self, painter, rect):
-        """绘制背景网格"""
+        """
+        绘制背景：网格由覆盖画布的网格图层绘制；视图比画布大时（例如默认画布小于最大化窗口），
+        画布以外的可见区域不在图层范围内，在此补绘网格
+        """
         super().drawBackground(painter, rect)
+        canvas_rect = self.sceneRect()
+        if canvas_rect.contains(rect):
+            return
+        outside_path = QPainterPath()
+        outside_path.addRect(rect)
+        canvas_path = QPainterPath()
+        canvas_path.addRect(canvas_rect)
+        painter.save()
+        painter.setClipPath(outside_path.subtracted(canvas_path), Qt.ClipOperation.IntersectClip)
+        self.grid_item.paint_grid(painter, rect)
+        painter.restore()
+
+    def update_scene_bounds(self, items_rect=None):
+        """
+        动态更新画布大小以容纳所有元素（只增大，不减小）
 
-        painter.setPen(QPen(self.grid_qcolor, 1))
-
-        # 绘制垂直线
-        left = int(rect.left()) - (int(rect.left()) % self.grid_size)
-        right = int(rect.right())
-        top = int(rect.top())
-        bottom = int(rect.bottom())
-        for x in range(left, right, self.grid_size):
-            painter.drawLine(x, top, x, bottom)
-
-        # 绘制水平线
-        top = int(rect.top()) - (int(rect.top()) % self.grid_size)
-        bottom = int(rect.bottom())
-        left = int(rect.left())
-        right = int(rect.right())
-        for y in range(top, bottom, self.grid_size):
-            painter.drawLine(left, y, right, y)
-
-    def update_scene_bounds(self):
-        """动态更新画布大小以容纳所有元素（只增大，不减小）"""
-        items_rect = self.itemsBoundingRect()
+        Args:
+            items_rect: 已知的内容外接矩形；为None时重新计算全部元素与连接线的范围
+        """
+        if items_rect is None:
+            # 全量重算前先补算延迟的连接线，否则会按旧路径计算范围
+            self.flush_deferred_connections()
+            items_rect = self._content_rect()
+            self._items_rect = self._items_rect.united(items_rect)
         
         if items_rect.isNull() or items_rect.isEmpty():
             return
         
-        # 添加边距
-        min_left = items_rect.left() - self.padding
-        min_top = items_rect.top() - self.padding
-        max_right = items_rect.right() + self.padding
-        max_bottom = items_rect.bottom() + self.padding
-        
         # 调试信息
-        print(f"项目边界: left={items_rect.left():.0f}, top={items_rect.top():.0f}, "
-              f"right={items_rect.right():.0f}, bottom={items_rect.bottom():.0f}")
-        
-        # 计算新的起点和尺寸
-        new_origin_x = min_left
-        new_origin_y = min_top
-        new_width = max_right - new_origin_x
-        new_height = max_bottom - new_origin_y
-        
-        # 确保不小于最小尺寸
-        new_width = max(new_width, self.min_width)
-        new_height = max(new_height, self.min_height)
-        
-        # 只增大，不减小
-        actual_origin_x = min(self.scene_origin_x, new_origin_x)
-        actual_origin_y = min(self.scene_origin_y, new_origin_y)
-        
-        actual_width = max(max_right - actual_origin_x, self.current_max_width)
-        actual_height = max(max_bottom - actual_origin_y, self.current_max_height)
-        
+        logger.debug("项目边界: left=%.0f, top=%.0f, right=%.0f, bottom=%.0f",
+                     items_rect.left(), items_rect.top(), items_rect.right(), items_rect.bottom())
+
+        # 内容范围加上边距后与当前画布取并集：只增大，不减小；
+        # 初始画布已不小于最小尺寸，并集自然也满足最小尺寸
+        padding = self.padding
+        canvas_rect = self.sceneRect()
+        new_rect = canvas_rect.united(items_rect.adjusted(-padding, -padding, padding, padding))
+
         # 更新记录的起点和尺寸
-        if (actual_origin_x != self.scene_origin_x or 
-            actual_origin_y != self.scene_origin_y or
-            actual_width > self.current_max_width or 
-            actual_height > self.current_max_height):
-            
-            self.scene_origin_x = actual_origin_x
-            self.scene_origin_y = actual_origin_y
-            self.current_max_width = actual_width
-            self.current_max_height = actual_height
-            
-            self.setSceneRect(self.scene_origin_x, self.scene_origin_y,
-                            self.current_max_width, self.current_max_height)
-            
-            print(f"画布更新: origin=({self.scene_origin_x:.0f}, {self.scene_origin_y:.0f}), "
-                  f"size=({self.current_max_width:.0f} x {self.current_max_height:.0f})")
-    
+        if new_rect != canvas_rect:
+            self.scene_origin_x = new_rect.left()
+            self.scene_origin_y = new_rect.top()
+            self.current_max_width = new_rect.width()
+            self.current_max_height = new_rect.height()
+
+            self.setSceneRect(new_rect)
+
+            logger.debug("画布更新: origin=(%.0f, %.0f), size=(%.0f x %.0f)",
+                         self.scene_origin_x, self.scene_origin_y,
+                         self.current_max_width, self.current_max_height)
+
+    def _content_rect(self):
+        """流程图元素、连接线及其标签的外接矩形（代替遍历全部图元及其子项的itemsBoundingRect）"""
+        items_rect = QRectF()
+        for item in self.flow_items:
+            items_rect = items_rect.united(item.fast_scene_rect())
+        for connection in self.connections:
+            items_rect = items_rect.united(connection.sceneBoundingRect())
+            if connection.label_item is not None:
+                items_rect = items_rect.united(connection.label_item.sceneBoundingRect())
+        return items_rect
+
+    def register_connection(self, connection):
+        """登记连接线：加入连接列表，并同步更新按元素的连接索引"""
+        self.connections.append(connection)
+        self.connections_version += 1
+        self.connections_by_item[connection.start_item].append(connection)
+        if connection.end_item is not connection.start_item:
+            self.connections_by_item[connection.end_item].append(connection)
+        self.incoming_by_kind[self._incoming_key(connection)].append(connection)
+
+    def unregister_connection(self, connection):
+        """注销连接线：从连接列表与按元素的连接索引中移除"""
+        if connection in self.connections:
+            self.connections.remove(connection)
+        self.connections_version += 1
+        self._offscreen_connections.discard(connection)
+        for item in (connection.start_item, connection.end_item):
+            item_connections = self.connections_by_item.get(item)
+            if item_connections and connection in item_connections:
+                item_connections.remove(connection)
+                if not item_connections:
+                    del self.connections_by_item[item]
+        key = self._incoming_key(connection)
+        incoming = self.incoming_by_kind.get(key)
+        if incoming and connection in incoming:
+            incoming.remove(connection)
+            if not incoming:
+                del self.incoming_by_kind[key]
+
+    @staticmethod
+    def _incoming_key(connection):
+        """连接线在 incoming_by_kind 中的索引键"""
+        return (connection.end_item, connection.end_point_type, connection.start_point_type)
+
+    def get_item_connections(self, item):
+        """获取起点或终点为指定元素的所有连接线"""
+        return self.connections_by_item.get(item, ())
+
+    def get_incoming_connections(self, item, end_point_type, start_point_type):
+        """获取终点为指定元素、且两端连接点类型匹配的连接线（按登记顺序）"""
+        return self.incoming_by_kind.get((item, end_point_type, start_point_type), ())
+
+    def schedule_item_update(self, item):
+        """记录元素移动后需要刷新的连接线与画布边界，同一帧内的多次移动只刷新一次"""
+        self._dirty_connections.update(self.get_item_connections(item))
+        self._moved_items.add(item)
+        self._rightmost_x_dirty = True
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_dirty(self):
+        """统一刷新累积的连接线路径与画布边界"""
+        dirty_connections = self._dirty_connections
+        self._dirty_connections = set()
+        self._update_connections_in_view(dirty_connections)
+        if self._moved_items:
+            moved_items = self._moved_items
+            self._moved_items = set()
+            if self._needs_bounds_update(moved_items):
+                self.update_scene_bounds()
+
+    def _needs_bounds_update(self, moved_items):
+        """
+        判断移动后的元素是否可能使画布需要扩大
+
+        画布只增大不减小，且始终在元素外围保留padding；只要移动过的元素及其连接线
+        仍位于画布向内收缩padding后的区域内，重新计算边界也不会有变化。
+        """
+        for item in moved_items:
+            if not self._fits_in_canvas(item.fast_scene_rect()):
+                return True
+            for connection in self.get_item_connections(item):
+                if connection in self._offscreen_connections:
+                    # 延迟的连接线路径仍是旧的，用两端点加余量估计其范围
+                    connection_rect = self._connection_extent(connection)
+                else:
+                    connection_rect = connection.sceneBoundingRect()
+                if not self._fits_in_canvas(connection_rect):
+                    return True
+        return False
+
+    def _fits_in_canvas(self, rect):
+        """矩形加上padding后是否仍完全位于当前画布内（是则不会引起画布扩大）"""
+        padding = self.padding
+        return self.sceneRect().adjusted(padding, padding, -padding, -padding).contains(rect)
+
+    def update_visible_connections(self):
+        """视图滚动、缩放或改变大小后，重算已进入可见区域的延迟连接线"""
+        if self._offscreen_connections:
+            offscreen_connections = self._offscreen_connections
+            self._offscreen_connections = set()
+            self._update_connections_in_view(offscreen_connections)
+
+    def flush_deferred_connections(self):
+        """
+        立即重算所有尚未刷新的连接线路径（等待下一帧的和位于视口外被延迟的）
+
+        读取连接线几何（导出图片、全量计算画布范围）前调用，保证路径与元素当前位置一致。
+        """
+        connections = self._dirty_connections | self._offscreen_connections
+        if not connections:
+            return
+        self._dirty_connections = set()
+        self._offscreen_connections = set()
+        for connection in connections:
+            # 跳过期间已被删除的连接
+            if connection.scene() is self:
+                connection.update_path()
+
+    def _update_connections_in_view(self, connections):
+        """重算可见连接线的路径，不可见的记入延迟集合"""
+        visible_rect = self._visible_scene_rect()
+        for connection in connections:
+            # 跳过期间已被删除的连接
+            if connection.scene() is not self:
+                continue
+            if visible_rect is not None and not self._connection_extent(connection).intersects(visible_rect):
+                self._offscreen_connections.add(connection)
+                continue
+            connection.update_path()
+
+    def _visible_scene_rect(self):
+        """所有视图可见区域在场景坐标下的并集（没有视图时返回None，表示不做裁剪）"""
+        visible_rect = None
+        for view in self.views():
+            view_rect = view.mapToScene(view.viewport().rect()).boundingRect()
+            visible_rect = view_rect if visible_rect is None else visible_rect.united(view_rect)
+        return visible_rect
+
+    @staticmethod
+    def _connection_extent(connection, margin=50):
+        """连接线可能占据的场景区域：两端点与当前路径的外接矩形，并留出余量"""
+        start_pos = connection.start_item.anchor_scene_pos(connection.start_point_type)
+        end_pos = connection.end_item.anchor_scene_pos(connection.end_point_type)
+        extent = QRectF(start_pos, end_pos).normalized().united(connection.sceneBoundingRect())
+        return extent.adjusted(-margin, -margin, margin, margin)
+
+    def relayout_all(self):
+        """
+        批量重算全部连接线路径
+
+        各函数块（由连接线连通的元素集合）的最右边缘只计算一次并在本批次内共享，
+        避免每条 right->up 连接都单独遍历一遍所属函数块。
+        """
+        self.function_rightmost_cache = self._build_function_rightmost_cache()
+        try:
+            for connection in self.connections:
+                if connection.scene() is self:
+                    connection.update_path()
+        finally:
+            self.function_rightmost_cache = None
+
+    def _build_function_rightmost_cache(self):
+        """按连通分量遍历元素，返回 元素 -> 所在函数块最右边缘X坐标 的映射"""
+        cache = {}
+        for root in list(self.connections_by_item):
+            if root in cache:
+                continue
+            component = [root]
+            seen = {root}
+            index = 0
+            while index < len(component):
+                current = component[index]
+                index += 1
+                for conn in self.connections_by_item.get(current, ()):
+                    for neighbor in (conn.start_item, conn.end_item):
+                        if neighbor is not None and neighbor not in seen:
+                            seen.add(neighbor)
+                            component.append(neighbor)
+            rightmost = max(item.sceneBoundingRect().right() for item in component)
+            for item in component:
+                cache[item] = rightmost
+        return cache
+
+    def rightmost_x(self):
+        """获取所有流程图元素右边缘的最大X坐标（无元素时返回None），结果缓存至元素增删或移动"""
+        if self._rightmost_x_dirty:
+            self._rightmost_x = max((item.fast_scene_rect().right() for item in self.flow_items), default=None)
+            self._rightmost_x_dirty = False
+        return self._rightmost_x
+
     def addItem(self, item):
         """重写addItem方法，在添加元素后更新画布大小"""
         super().addItem(item)
-        if isinstance(item, FlowchartItem) and not self.batch_loading:
-            self.update_scene_bounds()
+        if isinstance(item, FlowchartItem):
+            self.flow_items.add(item)
+            self._rightmost_x_dirty = True
+            # 只把新元素合并进累积范围，而不是重新遍历全部元素；新元素落在画布内部时无需更新
+            item_rect = item.fast_scene_rect()
+            self._items_rect = self._items_rect.united(item_rect)
+            if not self.batch_loading and not self._fits_in_canvas(item_rect):
+                self.update_scene_bounds(self._items_rect)
+
+    def removeItem(self, item):
+        """重写removeItem方法，同步维护流程图元素集合"""
+        super().removeItem(item)
+        if item in self.flow_items:
+            self.flow_items.discard(item)
+            self._rightmost_x_dirty = True
 
     def handle_connection_point_click(self, connection_point, event):
         """处理连接点点击事件"""
-        print(f"\n=== 场景处理连接点点击 ===")
-        print(f"连接点: {connection_point}")
-        print(f"连接点类型: {connection_point.point_type}")
-        print(f"start_connection: {self.start_connection}")
+        logger.debug("场景处理连接点点击: 连接点=%s, 类型=%s, start_connection=%s",
+                     connection_point, connection_point.point_type, self.start_connection)
 
         if not self.start_connection:
             # 开始连接
             self.start_connection = connection_point
-            connection_point.setBrush(QBrush(Qt.GlobalColor.blue))
+            connection_point.setBrush(_START_POINT_BRUSH)
             connection_point.update()
-            print(f"开始连接: {connection_point.point_type}")
+            logger.debug("开始连接: %s", connection_point.point_type)
         else:
             # 结束连接
             end_connection = connection_point
@@ -140,7 +379,7 @@ class FlowchartScene(QGraphicsScene):
             # 检查是否连接到同一元素
             if self.start_connection.parent_item == end_connection.parent_item:
                 QMessageBox.warning(None, "错误", "不能连接同一元素的连接点")
-                self.start_connection.setBrush(QBrush(Qt.GlobalColor.red))
+                self.start_connection.setBrush(_POINT_BRUSH)
                 self.start_connection.update()
                 self.start_connection = None
                 return
@@ -150,33 +389,14 @@ class FlowchartScene(QGraphicsScene):
             end_point_type = end_connection.point_type
             end_item_type = end_connection.parent_item.item_type
 
-            valid = False
-            # 直接连接规则
-            if (start_point_type == 'down' and end_point_type == 'up') or \
-                    (start_point_type == 'right' and end_point_type == 'left') or \
-                    (start_point_type == 'right' and end_point_type == 'right') or \
-                    (start_point_type == 'left' and end_point_type == 'left'):
-                valid = True
-            # 判断结构特殊连接规则
-            elif end_item_type == 'decision' and end_point_type == 'up':
-                if start_point_type in ['left', 'right', 'down']:
-                    valid = True
-            # 其他连接规则
-            elif (start_point_type in ['left', 'right']) and end_point_type == 'up':
-                valid = True
-            elif start_point_type == 'left' and end_point_type == 'right':
-                valid = True
-            elif start_point_type == 'down' and end_point_type in ['left', 'right']:
-                valid = True
-
-            print(f"\n=== 连接规则检查 ===")
-            print(f"连接类型: {start_point_type} → {end_point_type}")
-            print(f"终点元素类型: {end_item_type}")
-            print(f"连接是否有效: {valid}")
+            valid = (start_point_type, end_point_type) in _VALID_CONNECTIONS
+
+            logger.debug("连接规则检查: %s → %s, 终点元素类型=%s, 是否有效=%s",
+                         start_point_type, end_point_type, end_item_type, valid)
 
             if not valid:
                 QMessageBox.warning(None, "错误", f"不允许的连接方式: {start_point_type} → {end_point_type}")
-                self.start_connection.setBrush(QBrush(Qt.GlobalColor.red))
+                self.start_connection.setBrush(_POINT_BRUSH)
                 self.start_connection.update()
                 self.start_connection = None
                 return
@@ -189,18 +409,18 @@ class FlowchartScene(QGraphicsScene):
                 end_point_type
             )
             self.addItem(connection)
-            self.connections.append(connection)
+            self.register_connection(connection)
             connection.update_path()
 
-            print(f"\n=== 连接创建成功 ===")
-            print(f"当前连接数量: {len(self.connections)}")
+            logger.debug("连接创建成功，当前连接数量: %d", len(self.connections))
 
             # 重置起始连接点
-            self.start_connection.setBrush(QBrush(Qt.GlobalColor.red))
+            self.start_connection.setBrush(_POINT_BRUSH)
             self.start_connection = None
 
     def mousePressEvent(self, event):
         """处理鼠标按下事件"""
+        # 点中的项目决定是否清空或保留选择，非调试模式下也需要
         clicked_item = self.itemAt(event.scenePos(), QTransform())
 
         # 向上查找父级，获取真正的 FlowchartItem（避免点击到文本、子元素时误判）
@@ -208,44 +428,46 @@ class FlowchartScene(QGraphicsScene):
         while flow_item and not isinstance(flow_item, FlowchartItem):
             flow_item = flow_item.parentItem()
 
-        print(f"\n=== 鼠标按下事件 ===")
-        print(f"点击位置: {event.scenePos()}")
-        print(f"点击的项目类型: {clicked_item.__class__.__name__ if clicked_item else 'None'}")
-
         # 如果点击在空白处（没有 FlowchartItem 或 ConnectionPoint），取消所有选择
+        saved_selected_items = None
         if flow_item is None and not isinstance(clicked_item, ConnectionPoint):
             for selected_item in self.selectedItems():
                 selected_item.setSelected(False)
         elif flow_item:
             # 点击在 FlowchartItem 上：如果该元素已选中且未按 Ctrl，先保存当前选择，稍后恢复
             if flow_item.isSelected() and not (event.modifiers() & Qt.KeyboardModifier.ControlModifier):
-                self._preserve_selection = True
-                self._saved_selected_items = [i for i in self.selectedItems() if isinstance(i, FlowchartItem)]
-            else:
-                self._preserve_selection = False
+                saved_selected_items = [i for i in self.selectedItems() if isinstance(i, FlowchartItem)]
 
-        if clicked_item:
-            print(f"项目信息: {clicked_item}")
+        if logger.is_enabled_for(DEBUG):
+            logger.debug("鼠标按下: 位置=%s, 项目=%s", event.scenePos(), clicked_item)
             if isinstance(clicked_item, ConnectionPoint):
-                print(f"连接点类型: {clicked_item.point_type}")
+                logger.debug("连接点类型: %s", clicked_item.point_type)
             elif flow_item:
-                print(f"流程图元素类型: {flow_item.item_type}")
+                logger.debug("流程图元素类型: %s", flow_item.item_type)
 
         super().mousePressEvent(event)
         
         # 如果点击的是已选中的 FlowchartItem，恢复多选状态
-        if hasattr(self, '_preserve_selection') and self._preserve_selection:
-            if hasattr(self, '_saved_selected_items'):
-                for saved_item in self._saved_selected_items:
-                    if saved_item.scene() == self:  # 确保项还在场景中
-                        saved_item.setSelected(True)
-                delattr(self, '_saved_selected_items')
-            delattr(self, '_preserve_selection')
+        if saved_selected_items:
+            for saved_item in saved_selected_items:
+                if saved_item.scene() is self:  # 确保项还在场景中
+                    saved_item.setSelected(True)
 
     def clear(self):
-        """清空场景"""
+        """清空场景（背景网格图层保留）"""
+        super().removeItem(self.grid_item)
         super().clear()
+        super().addItem(self.grid_item)
         self.connections.clear()
+        self.connections_by_item.clear()
+        self.incoming_by_kind.clear()
+        self.connections_version += 1
+        self._dirty_connections.clear()
+        self._offscreen_connections.clear()
+        self._moved_items.clear()
+        self.flow_items.clear()
+        self._rightmost_x_dirty = True
+        self._items_rect = QRectF()
         self.start_connection = None
         
         # 重置画布大小
@@ -0,0 +1,104 @@
+"""
+背景网格图层
+"""
+from PyQt6.QtWidgets import QGraphicsItem
+from PyQt6.QtGui import QPen, QPixmap, QPainter
+from PyQt6.QtCore import Qt, QRectF, QLineF
+
+
+class GridBackgroundItem(QGraphicsItem):
+    """
+    背景网格图层
+
+    覆盖整个画布、位于最底层的图元。渲染结果按设备坐标缓存，平移和局部重绘时直接复用，
+    只有缩放或调用update()（网格/背景颜色变化）时才重新绘制。网格大小与颜色读取所在场景的
+    grid_size、background_color、grid_qcolor 属性。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._rect = QRectF()
+        # 网格线画笔，按网格颜色缓存
+        self._grid_pen = None
+        # 预渲染的单格网格贴图及其对应的(网格大小, 背景色, 网格色)，颜色或大小变化时重建
+        self._grid_tile = None
+        self._grid_tile_key = None
+
+        self.setZValue(-1000)
+        self.setCacheMode(QGraphicsItem.CacheMode.DeviceCoordinateCache)
+        # 需要 option.exposedRect 只绘制暴露区域，而不是整个画布
+        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemUsesExtendedStyleOption, True)
+        self.setAcceptedMouseButtons(Qt.MouseButton.NoButton)
+        self.setAcceptHoverEvents(False)
+
+    def set_rect(self, rect):
+        """设置网格覆盖的范围（与画布范围一致）"""
+        self.prepareGeometryChange()
+        self._rect = QRectF(rect)
+
+    def boundingRect(self):
+        """边界矩形即画布范围"""
+        return self._rect
+
+    def _get_grid_tile(self, scene):
+        """获取一个网格单元大小的背景贴图（背景色 + 左侧与顶部各一条网格线）"""
+        tile_key = (scene.grid_size, scene.background_color.rgba(), scene.grid_qcolor.rgba())
+        if tile_key != self._grid_tile_key:
+            tile = QPixmap(scene.grid_size, scene.grid_size)
+            tile.fill(scene.background_color)
+            tile_painter = QPainter(tile)
+            tile_painter.setPen(QPen(scene.grid_qcolor, 1))
+            tile_painter.drawLine(0, 0, 0, scene.grid_size)
+            tile_painter.drawLine(0, 0, scene.grid_size, 0)
+            tile_painter.end()
+            self._grid_tile = tile
+            self._grid_tile_key = tile_key
+        return self._grid_tile
+
+    def paint(self, painter, option, widget=None):
+        """绘制背景网格（背景色由场景的背景画刷填充）"""
+        self.paint_grid(painter, option.exposedRect)
+
+    def paint_grid(self, painter, rect):
+        """
+        在场景坐标矩形 rect 内绘制网格
+
+        除图层自身的绘制外，场景也用它为画布范围以外的视口区域补绘网格。
+        """
+        scene = self.scene()
+        if scene is None:
+            return
+        grid_size = scene.grid_size
+
+        transform = painter.worldTransform()
+        if transform.m11() == 1 and transform.m22() == 1 and not transform.isRotating():
+            # 未缩放时直接平铺预渲染的网格贴图，一次绘制完成背景与网格；
+            # 缩放后贴图会被放大或抽样丢线，仍按矢量逐线绘制
+            left = int(rect.left()) - (int(rect.left()) % grid_size)
+            top = int(rect.top()) - (int(rect.top()) % grid_size)
+            painter.drawTiledPixmap(QRectF(left, top, rect.right() - left, rect.bottom() - top),
+                                    self._get_grid_tile(scene))
+            return
+
+        if self._grid_pen is None or self._grid_pen.color() != scene.grid_qcolor:
+            # 细线画笔：缩放时始终保持1像素宽
+            self._grid_pen = QPen(scene.grid_qcolor, 1)
+            self._grid_pen.setCosmetic(True)
+        painter.setPen(self._grid_pen)
+
+        # 按水平条带绘制：每个条带内的水平线与该段垂直线一起提交，
+        # 相邻写入落在同一片帧缓冲区域内，比先画完全部垂直线再画水平线更利于缓存
+        left = int(rect.left())
+        right = int(rect.right())
+        top = int(rect.top())
+        bottom = int(rect.bottom())
+        grid_left = left - (left % grid_size)
+        grid_top = top - (top % grid_size)
+        vertical_xs = range(grid_left, right, grid_size)
+        strip_height = grid_size * 8
+        for strip_top in range(grid_top, bottom, strip_height):
+            strip_bottom = min(strip_top + strip_height, bottom)
+            segment_top = max(strip_top, top)
+            lines = [QLineF(x, segment_top, x, strip_bottom) for x in vertical_xs]
+            lines.extend(QLineF(left, y, right, y) for y in range(strip_top, strip_bottom, grid_size))
+            painter.drawLines(lines)
@@ -2,11 +2,16 @@
 流程图视图类
 """
 from PyQt6.QtWidgets import QGraphicsView, QGraphicsRectItem
-from PyQt6.QtGui import QPainter, QPen, QBrush, QColor
+from PyQt6.QtGui import QPainter, QPen, QBrush, QColor, QSurfaceFormat
 from PyQt6.QtCore import Qt, QRectF, QPointF
 from PyQt6.QtWidgets import QGraphicsItem
 from utils.config_manager import get_config
 
+try:
+    from PyQt6.QtOpenGLWidgets import QOpenGLWidget
+except ImportError:  # 部分PyQt6发行版未包含OpenGL模块
+    QOpenGLWidget = None
+
 from GUI.items import FlowchartItem
 
 
@@ -19,6 +24,21 @@ class FlowchartView(QGraphicsView):
         self.setDragMode(QGraphicsView.DragMode.ScrollHandDrag)
         self.setTransformationAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
         self.setResizeAnchor(QGraphicsView.ViewportAnchor.AnchorUnderMouse)
+        # 各元素的paint都会自行设置画笔和画刷，无需视图保存/恢复画家状态
+        self.setOptimizationFlag(QGraphicsView.OptimizationFlag.DontSavePainterState, True)
+        # 使用OpenGL视口，由GPU光栅化元素与连接线路径（仅在创建视图时读取配置，修改后需重启生效）
+        if QOpenGLWidget is not None and get_config('view', 'opengl', default=False):
+            gl_widget = QOpenGLWidget()
+            # 多重采样，否则GL视口上抗锯齿渲染提示不起作用
+            surface_format = QSurfaceFormat()
+            surface_format.setSamples(4)
+            gl_widget.setFormat(surface_format)
+            self.setViewport(gl_widget)
+            # QOpenGLWidget 不支持局部更新，每帧都会丢弃帧缓冲，只重绘脏区域会在其余区域留下残影
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
+        else:
+            # 光栅视口：只重绘所有变化区域的外接矩形（一次绘制，而不是逐块重绘多个小区域）
+            self.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.BoundingRectViewportUpdate)
 
         # 支持缩放
         self.scale_factor = 1.0
@@ -37,14 +57,8 @@ class FlowchartView(QGraphicsView):
             zoom_out_factor = get_config('view', 'zoom', 'out_factor', default=0.8)
             min_scale = get_config('view', 'zoom', 'min_scale', default=0.2)
 
-            # 获取鼠标位置
-            mouse_pos = event.position()
-            scene_pos = self.mapToScene(mouse_pos.toPoint())
-
-            # 保存当前视图中心
-            self.centerOn(scene_pos)
-
-            # 缩放
+            # 缩放：视图的变换锚点为 AnchorUnderMouse，scale() 本身即保持鼠标下的场景点不动，
+            # 无需在缩放前后各 centerOn 一次（每次都会触发滚动条计算与整屏重绘）
             if event.angleDelta().y() > 0:
                 # 放大
                 self.scale(zoom_in_factor, zoom_in_factor)
@@ -55,11 +69,26 @@ class FlowchartView(QGraphicsView):
                     self.scale(zoom_out_factor, zoom_out_factor)
                     self.scale_factor *= zoom_out_factor
 
-            # 恢复视图中心
-            self.centerOn(scene_pos)
+            self._update_visible_connections()
             event.accept()
         else:
             super().wheelEvent(event)
+
+    def scrollContentsBy(self, dx, dy):
+        """滚动时重算进入可见区域的延迟连接线"""
+        super().scrollContentsBy(dx, dy)
+        self._update_visible_connections()
+
+    def resizeEvent(self, event):
+        """视图大小变化时重算进入可见区域的延迟连接线"""
+        super().resizeEvent(event)
+        self._update_visible_connections()
+
+    def _update_visible_connections(self):
+        """通知场景处理可见区域内的延迟连接线"""
+        scene = self.scene()
+        if scene is not None and hasattr(scene, 'update_visible_connections'):
+            scene.update_visible_connections()
     
     def mousePressEvent(self, event):
         """鼠标按下事件"""
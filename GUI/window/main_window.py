@@ -2,11 +2,11 @@
 主窗口类
 """
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QLabel, QTextEdit, QFileDialog, QMessageBox, QGraphicsView, QCheckBox)
+                             QLabel, QTextEdit, QFileDialog, QMessageBox, QCheckBox)
 from PyQt6.QtGui import QAction, QImage, QPainter
-from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtCore import Qt, QRectF, QPointF, QTimer
 
-from GUI.items import ITEM_TYPES, FlowchartItem, ConnectionPoint, ConnectionLine
+from GUI.items import ITEM_TYPES, FlowchartItem, ConnectionLine
 from GUI.scene import FlowchartScene
 from GUI.view import FlowchartView
 from GUI.window.settings_window import SettingsWindow
@@ -42,6 +42,14 @@ class MainWindow(QMainWindow):
         self.scene = FlowchartScene()
         self.view = FlowchartView(self.scene)
 
+        # 右侧文本框的输入合并后再写回元素，避免每次按键都重新布局文本
+        self._pending_text_item = None
+        self._pending_text = None
+        self._text_update_timer = QTimer(self)
+        self._text_update_timer.setSingleShot(True)
+        self._text_update_timer.setInterval(50)
+        self._text_update_timer.timeout.connect(self._apply_text_to_selection)
+
         # 创建主布局
         main_widget = QWidget()
         main_layout = QHBoxLayout()
@@ -300,6 +308,7 @@ class MainWindow(QMainWindow):
 
     def save_flowchart(self):
         """保存流程图"""
+        self._flush_pending_text()
         try:
             from utils.io_operations import save_flowchart
             save_flowchart(self.scene, self)
@@ -324,31 +333,30 @@ class MainWindow(QMainWindow):
 
     def export_to_image(self):
         """导出流程图为图片"""
+        self._flush_pending_text()
         from PyQt6.QtWidgets import QGraphicsScene
 
-        # 获取场景中所有元素（跳过连接点）
-        items = []
-        for item in self.scene.items():
-            if not isinstance(item, ConnectionPoint):
-                items.append(item)
+        # 视口外延迟重算的连接线仍保留旧路径，先补算，保证导出范围与实际路径一致
+        self.scene.flush_deferred_connections()
+
+        # 只遍历一次场景，按类型取出流程图元素（连接点、背景网格等自然被排除）
+        flow_items = [item for item in self.scene.items() if isinstance(item, FlowchartItem)]
 
-        if not items:
+        if not flow_items:
             QMessageBox.warning(self, "警告", "场景中没有元素可导出")
             return
 
-        # 计算包含所有元素的边界矩形
-        first_item_rect = items[0].sceneBoundingRect()
-        min_x = first_item_rect.left()
-        max_x = first_item_rect.right()
-        min_y = first_item_rect.top()
-        max_y = first_item_rect.bottom()
-
-        for item in items[1:]:
-            rect = item.sceneBoundingRect()
-            min_x = min(min_x, rect.left())
-            max_x = max(max_x, rect.right())
-            min_y = min(min_y, rect.top())
-            max_y = max(max_y, rect.bottom())
+        # 计算包含所有元素、连接线及其标签的边界矩形（连接线绕行时可能超出元素范围），
+        # 每个元素只取一次边界，再用内置min/max归约
+        connections = self.scene.connections
+        rects = [item.sceneBoundingRect() for item in flow_items]
+        rects.extend(connection.sceneBoundingRect() for connection in connections)
+        rects.extend(connection.label_item.sceneBoundingRect() for connection in connections
+                     if connection.label_item is not None)
+        min_x = min(rect.left() for rect in rects)
+        max_x = max(rect.right() for rect in rects)
+        min_y = min(rect.top() for rect in rects)
+        max_y = max(rect.bottom() for rect in rects)
 
         # 从配置文件加载导出设置
         margin = get_config('export', 'margin', default=30)
@@ -376,43 +384,34 @@ class MainWindow(QMainWindow):
         try:
             # 创建临时场景
             temp_scene = QGraphicsScene()
+            # 临时场景只批量添加元素后渲染一次，不需要维护BSP索引
+            temp_scene.setItemIndexMethod(QGraphicsScene.ItemIndexMethod.NoIndex)
             temp_scene.setBackgroundBrush(Qt.GlobalColor.white)
-            temp_view = QGraphicsView(temp_scene)
-
-            temp_view.setRenderHint(QPainter.RenderHint.Antialiasing)
-            temp_view.setRenderHint(QPainter.RenderHint.TextAntialiasing)
-            temp_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            temp_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-            temp_view.setViewportUpdateMode(QGraphicsView.ViewportUpdateMode.FullViewportUpdate)
 
             # 复制所有元素到临时场景
+            export_left = export_rect.left()
+            export_top = export_rect.top()
             item_map = {}
 
-            for item in self.scene.items():
-                if isinstance(item, ConnectionPoint):
-                    continue
-
-                if hasattr(item, 'item_type'):
-                    relative_x = item.x() - export_rect.left()
-                    relative_y = item.y() - export_rect.top()
-
-                    temp_item = FlowchartItem(
-                        item.item_type,
-                        relative_x,
-                        relative_y,
-                        item.width,
-                        item.height
-                    )
-                    temp_item.setText(item.text)
-
-                    for point in temp_item.connection_points.values():
-                        point.setVisible(False)
-
-                    temp_scene.addItem(temp_item)
-                    item_map[item] = temp_item
-
-            # 复制所有连接线
-            for connection in self.scene.connections:
+            for item in flow_items:
+                temp_item = FlowchartItem(
+                    item.item_type,
+                    item.x() - export_left,
+                    item.y() - export_top,
+                    item.width,
+                    item.height
+                )
+                temp_item.setText(item.text)
+
+                for point in temp_item.connection_points.values():
+                    point.setVisible(False)
+
+                temp_scene.addItem(temp_item)
+                item_map[item] = temp_item
+
+            # 复制所有连接线（路径计算会参考已加入的连接线，列表逐条追加）
+            temp_scene.connections = []
+            for connection in connections:
                 if connection.start_item in item_map and connection.end_item in item_map:
                     temp_connection = ConnectionLine(
                         item_map[connection.start_item],
@@ -423,7 +422,7 @@ class MainWindow(QMainWindow):
                     temp_connection.label = getattr(connection, 'label', None)
                     
                     temp_scene.addItem(temp_connection)
-                    temp_scene.connections = getattr(temp_scene, 'connections', []) + [temp_connection]
+                    temp_scene.connections.append(temp_connection)
                     
                     temp_connection.update_path()
                     
@@ -433,16 +432,14 @@ class MainWindow(QMainWindow):
                         if temp_connection.label_item and temp_connection.label_item.scene() is None:
                             temp_scene.addItem(temp_connection.label_item)
 
-            # 设置视图大小
+            # 设置场景范围（直接渲染场景，无需创建视图）
             temp_scene.setSceneRect(0, 0, export_rect.width(), export_rect.height())
-            temp_view.resize(int(export_rect.width()), int(export_rect.height()))
-            temp_view.setScene(temp_scene)
 
-            # 创建图像
+            # 创建图像（预乘Alpha格式是光栅引擎绘制抗锯齿图形的快速路径）
             image = QImage(
                 int(export_rect.width()),
                 int(export_rect.height()),
-                QImage.Format.Format_RGB32
+                QImage.Format.Format_ARGB32_Premultiplied
             )
             export_bg_value = get_config('export', 'background_color', default=[255, 255, 255])
             export_bg_color = to_qcolor(export_bg_value, [255, 255, 255])
@@ -452,8 +449,10 @@ class MainWindow(QMainWindow):
             painter = QPainter(image)
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
-            temp_scene.render(painter)
+            temp_scene.render(painter, QRectF(image.rect()), temp_scene.sceneRect())
             painter.end()
+            # 背景不透明，保存前转回RGB32，导出文件不带Alpha通道
+            image = image.convertToFormat(QImage.Format.Format_RGB32)
 
             # 显示保存文件对话框
             default_filename = get_config('export', 'default_filename', default='C流程图.png')
@@ -482,15 +481,15 @@ class MainWindow(QMainWindow):
             traceback.print_exc()
 
         finally:
-            del temp_view
             del temp_scene
 
     def on_selection_changed(self):
         """处理选择变化事件"""
+        # 先把尚未写回的文本提交给原先选中的元素
+        self._flush_pending_text()
         selected_items = self.scene.selectedItems()
 
-        print(f"\n=== 选择变化事件 ===")
-        print(f"选中的项目数量: {len(selected_items)}")
+        logger.debug("选择变化事件，选中的项目数量: %d", len(selected_items))
 
         flowchart_items = []
         for item in selected_items:
@@ -509,16 +508,16 @@ class MainWindow(QMainWindow):
             item_type_name = ITEM_TYPES.get(selected_item.item_type, {}).get('name', selected_item.item_type)
             self.element_type_label.setText(f"类型: {item_type_name}")
 
-            print(f"\n✓ 成功更新右侧工具栏")
+            logger.debug("✓ 成功更新右侧工具栏")
         else:
             self.text_edit.setDisabled(True)
             self.text_edit.clear()
             self.element_type_label.setText("类型: -")
 
-            print(f"\n✗ 没有选中FlowchartItem")
+            logger.debug("✗ 没有选中FlowchartItem")
 
     def on_text_changed(self):
-        """处理文本变化事件，实时更新"""
+        """处理文本变化事件：记录待写回的元素与文本，连续输入合并为一次更新"""
         selected_items = self.scene.selectedItems()
 
         flowchart_items = []
@@ -527,17 +526,33 @@ class MainWindow(QMainWindow):
                 flowchart_items.append(item)
 
         if flowchart_items:
-            selected_item = flowchart_items[0]
-            new_text = self.text_edit.toPlainText()
+            self._pending_text_item = flowchart_items[0]
+            self._pending_text = self.text_edit.toPlainText()
+            self._text_update_timer.start()
+
+    def _flush_pending_text(self):
+        """立即写回尚未提交的文本（选择变化、保存、导出前调用）"""
+        if self._text_update_timer.isActive():
+            self._text_update_timer.stop()
+            self._apply_text_to_selection()
+
+    def _apply_text_to_selection(self):
+        """把合并后的文本写回输入时选中的元素"""
+        selected_item = self._pending_text_item
+        new_text = self._pending_text
+        self._pending_text_item = None
+        self._pending_text = None
+        if selected_item is None or selected_item.scene() is None:
+            return
 
-            # 使用统一的 setText，保持居中与转义逻辑一致
-            if hasattr(selected_item, "setText"):
-                selected_item.setText(new_text)
-            else:
-                # 兼容性兜底：保持旧逻辑
-                selected_item.text_item.setPlainText(new_text)
-                selected_item.text = new_text
-                selected_item.update_text_position()
+        # 使用统一的 setText，保持居中与布局逻辑一致
+        if hasattr(selected_item, "setText"):
+            selected_item.setText(new_text)
+        else:
+            # 兼容性兜底：保持旧逻辑
+            selected_item.text_item.setPlainText(new_text)
+            selected_item.text = new_text
+            selected_item.update_text_position()
 
     def import_from_code(self):
         """从代码导入流程图"""
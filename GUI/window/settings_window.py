@@ -1,7 +1,6 @@
 """
 设置窗口类
 """
-import yaml
 from pathlib import Path
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, 
                              QWidget, QLabel, QLineEdit, QPushButton, QMessageBox,
@@ -13,6 +12,7 @@ from PyQt6.QtCore import Qt
 from GUI.items import FlowchartItem
 from utils.color_utils import COLOR_PRESETS, normalize_color, find_color_name, to_qcolor
 from utils.config_manager import config as global_config
+from utils.yaml_utils import load_yaml
 
 class SettingsWindow(QDialog):
     """设置窗口"""
@@ -37,9 +37,11 @@ class SettingsWindow(QDialog):
     
     def load_config(self):
         """加载配置文件"""
+        # 先写回配置管理器中尚未保存的修改，保证读到的是最新配置
+        global_config.flush()
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                self.config_data = yaml.safe_load(f)
+                self.config_data = load_yaml(f)
         except Exception as e:
             QMessageBox.warning(self, "警告", f"加载配置文件失败：{e}")
             self.config_data = {}
@@ -295,6 +297,18 @@ class SettingsWindow(QDialog):
         
         zoom_group.setLayout(zoom_layout)
         layout.addWidget(zoom_group)
+
+        # 渲染组
+        render_group = QGroupBox("渲染设置")
+        render_layout = QFormLayout()
+
+        self.add_bool_input(render_layout, "OpenGL硬件加速:", 'view', 'opengl')
+        opengl_hint = QLabel("修改后需重启程序生效；显卡驱动不支持时请保持关闭")
+        opengl_hint.setStyleSheet("QLabel { color: gray; }")
+        render_layout.addRow("", opengl_hint)
+
+        render_group.setLayout(render_layout)
+        layout.addWidget(render_group)
         
         layout.addStretch()
         
@@ -577,11 +591,16 @@ class SettingsWindow(QDialog):
             if keys[1] == 'background_color':
                 scene.background_color = to_qcolor(value, [230, 230, 230])
                 scene.setBackgroundBrush(QBrush(scene.background_color))
+                if hasattr(scene, 'grid_item'):
+                    # 网格图层带渲染缓存，需要显式失效
+                    scene.grid_item.update()
                 scene.update()
             elif keys[1] == 'grid_color':
                 rgb = normalize_color(value, [200, 200, 200])
                 scene.grid_color = rgb
                 scene.grid_qcolor = QColor(*rgb)
+                if hasattr(scene, 'grid_item'):
+                    scene.grid_item.update()
                 scene.update()
         elif len(keys) >= 2 and keys[0] == 'item' and keys[1] == 'colors':
             from GUI.items import FlowchartItem
@@ -609,10 +628,9 @@ class SettingsWindow(QDialog):
         current[keys[-1]] = value
     
     def save_value(self, keys, value):
-        """保存单个值到配置并立即写入文件"""
+        """保存单个值到配置并写入文件"""
         self.set_nested_value(self.config_data, keys, value)
         self.write_config_to_file()
-        global_config.update_in_memory(self.config_data)
         if keys == ('parser', 'multi_function'):
             parent = self.parent()
             from logger.logger import logger
@@ -621,12 +639,9 @@ class SettingsWindow(QDialog):
                 parent.set_multi_function_enabled(bool(value), persist=False)
 
     def write_config_to_file(self):
-        """将配置写入YAML文件"""
-        try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.config_data, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        except Exception as e:
-            print(f"保存配置失败：{e}")
+        """同步内存中的全局配置，并由配置管理器合并短时间内的连续修改后写入YAML文件"""
+        global_config.update_in_memory(self.config_data)
+        global_config.schedule_save()
     
     def save_settings(self):
         """保存所有设置"""
@@ -650,7 +665,6 @@ class SettingsWindow(QDialog):
             # 恢复默认配置
             self.config_data = self.get_default_config()
             self.write_config_to_file()
-            global_config.update_in_memory(self.config_data)
             
             # 刷新所有输入框
             self.refresh_all_inputs()
@@ -747,7 +761,8 @@ class SettingsWindow(QDialog):
             },
             'view': {
                 'zoom': {'in_factor': 1.25, 'out_factor': 0.8, 'min_scale': 0.2},
-                'drag_mode': 'scroll'
+                'drag_mode': 'scroll',
+                'opengl': False
             },
             'export': {
                 'default_filename': 'C流程图.png',
@@ -2,14 +2,74 @@ import json
 import sys
 import re
 from copy import deepcopy
+from pathlib import Path
 from logger.logger import logger
 from utils.config_manager import get_config
+from utils import json_utils
+
+# 节点标签与常用翻译文本（驻留为共享字符串，所有节点复用同一对象）
+TAG_IO = sys.intern("i/o")
+TAG_BRANCH = sys.intern("branch")
+TAG_LOOP = sys.intern("loop")
+TAG_STMT = sys.intern("statement")
+TAG_BLOCK = sys.intern("block")
+TAG_CONDITION = sys.intern("condition")
+TRANS_INPUT_X = sys.intern("输入变量x")
+TRANS_LOOP_BODY = sys.intern("循环体（判断为真时执行）")
+
+# 数据类型关键字
+_TYPE_KEYWORDS = frozenset({"int", "float", "double", "char", "bool", "long", "short", "unsigned", "signed", "auto",
+                            "const", "void", "static", "extern", "register"})
+# 变量声明前缀（类型关键字后跟空格或制表符），供 str.startswith 一次匹配
+_TYPE_KEYWORD_PREFIXES = tuple(f"{kw}{sep}" for kw in _TYPE_KEYWORDS for sep in (" ", "\t"))
+# 控制结构关键字（子串判断用）
+_CONTROL_KEYWORDS = ("if", "while", "for", "else", "return")
+# 函数声明判断时排除的前缀（控制结构与I/O函数）
+_DECL_EXCLUDED_PREFIXES = ("if", "while", "for", "else", "switch", "return",
+                           "scanf", "fscanf", "cin", "getline", "getchar",
+                           "cout", "printf", "puts", "putchar", "scanf_s",
+                           "print_s", "put", "fputs", "get")
+# 函数调用识别时排除的前缀（控制结构与已处理的I/O函数）
+_CALL_EXCLUDED_PREFIXES = ("if", "while", "for", "else", "switch", "return",
+                           "scanf", "fscanf", "cin", "getline", "getchar",
+                           "cout", "printf", "puts", "putchar")
+
+
+def _write_json_list(f, items, indent):
+    """逐个元素写出JSON数组，格式与 json.dump(indent=2) 一致；indent 为数组所在层的缩进"""
+    if not isinstance(items, list) or not items:
+        f.write(json.dumps(items, ensure_ascii=False, indent=2).replace('\n', '\n' + indent))
+        return
+    item_indent = indent + '  '
+    f.write('[')
+    for i, item in enumerate(items):
+        f.write(',\n' if i else '\n')
+        f.write(item_indent)
+        # JSON字符串内的换行已被转义，直接替换换行即可整体缩进子树
+        f.write(json.dumps(item, ensure_ascii=False, indent=2).replace('\n', '\n' + item_indent))
+    f.write('\n' + indent + ']')
+
+
+def _stream_json(f, payload):
+    """
+    按子树流式写出转换结果，避免一次性在内存中生成整棵树的缩进文本
+    支持两种顶层结构：节点列表，或 {"main": [...], "functions": [...]}
+    """
+    if isinstance(payload, dict) and payload:
+        f.write('{')
+        for i, (key, value) in enumerate(payload.items()):
+            f.write(',\n  ' if i else '\n  ')
+            f.write(json.dumps(key, ensure_ascii=False))
+            f.write(': ')
+            _write_json_list(f, value, '  ')
+        f.write('\n}')
+    else:
+        _write_json_list(f, payload, '')
 
 
 class CppToJsonConverter:
     def __init__(self, debug=False):
-        self.TYPE_KEYWORDS = {"int", "float", "double", "char", "bool", "long", "short", "unsigned", "signed", "auto",
-                              "const", "void", "static", "extern", "register"}
+        self.TYPE_KEYWORDS = _TYPE_KEYWORDS
         self.DECL_KEYWORDS = {"struct", "class", "enum", "typedef"}  # 类型声明关键字
         self.debug = debug
         # 输入函数特征（与原输入识别逻辑保持一致）
@@ -28,10 +88,10 @@ class CppToJsonConverter:
         return escape_count % 2 == 1
 
     def split_into_units(self, formatted_code):
-        """按分号+块标记拆分，确保每个语句独立"""
+        """按分号+块标记拆分，确保每个语句独立（生成器，逐个产出单元）"""
         self.log("开始拆分逻辑单元...")
-        units = []
-        current_unit = []
+        unit_count = 0
+        unit_start = 0  # 当前单元在源码中的起始位置，拆分时直接切片，避免逐字符累积
         in_string = False
         string_quote = ''
         brace_count = 0  # 跟踪括号嵌套深度（避免拆分for循环内部分号）
@@ -40,7 +100,6 @@ class CppToJsonConverter:
             if c in ('"', "'") and not self.is_escape_char(formatted_code, idx):
                 in_string = not in_string if c == string_quote else True
                 string_quote = c if in_string else ''
-                current_unit.append(c)
                 continue
 
             if not in_string:
@@ -52,37 +111,33 @@ class CppToJsonConverter:
                         brace_count -= 1
 
                 # 分号拆分语句：仅当不在括号内时才拆分
-                if c == ';' and brace_count == 0:
-                    current_unit.append(c)
-                    unit_str = ''.join(current_unit).strip()
+                elif c == ';' and brace_count == 0:
+                    unit_str = formatted_code[unit_start:idx + 1].strip()
                     if unit_str:
-                        units.append(unit_str)
+                        unit_count += 1
                         self.log(f"拆分语句单元: {unit_str}")
-                    current_unit = []
-                    continue
+                        yield unit_str
+                    unit_start = idx + 1
 
                 # 块标记单独拆分
-                if c in ('{', '}'):
-                    if current_unit:
-                        unit_str = ''.join(current_unit).strip()
-                        if unit_str:
-                            units.append(unit_str)
-                            self.log(f"拆分语句单元: {unit_str}")
-                        current_unit = []
-                    units.append(c)
+                elif c == '{' or c == '}':
+                    unit_str = formatted_code[unit_start:idx].strip()
+                    if unit_str:
+                        unit_count += 1
+                        self.log(f"拆分语句单元: {unit_str}")
+                        yield unit_str
+                    unit_count += 1
                     self.log(f"拆分块标记: {c}")
-                    continue
-
-            current_unit.append(c)
+                    yield c
+                    unit_start = idx + 1
 
-        if current_unit:
-            unit_str = ''.join(current_unit).strip()
-            if unit_str:
-                units.append(unit_str)
-                self.log(f"拆分剩余单元: {unit_str}")
+        unit_str = formatted_code[unit_start:].strip()
+        if unit_str:
+            unit_count += 1
+            self.log(f"拆分剩余单元: {unit_str}")
+            yield unit_str
 
-        self.log(f"拆分完成，共{len(units)}个单元")
-        return units
+        self.log(f"拆分完成，共{unit_count}个单元")
 
     def parse_cout_content(self, cout_unit):
         """解析cout输出内容"""
@@ -170,15 +225,16 @@ class CppToJsonConverter:
                 label_node = {
                     "original_unit": unit,
                     "translated": f"case {label}" if label != "默认" else "default",
-                    "tag": "statement",
+                    "tag": TAG_STMT,
                     "children": []
                 }
+                self.mark_has_input(label_node)
                 child_nodes = [label_node] + child_nodes
 
                 cases.append({
                     "original_unit": unit,
                     "translated": translated,
-                    "tag": "branch",
+                    "tag": TAG_BRANCH,
                     "type": "case_block",
                     "children": child_nodes
                 })
@@ -329,30 +385,22 @@ class CppToJsonConverter:
                 return True
 
         # 2. 变量声明（带数据类型关键字，且非函数/控制结构）
-        for type_kw in self.TYPE_KEYWORDS:
-            if (unit_stripped.startswith(f"{type_kw} ") or
-                unit_stripped.startswith(f"{type_kw}\t") or
-                unit_stripped == type_kw):
-                # 排除控制结构（if/while等）和函数调用
-                if not any(kw in unit_stripped for kw in ["if", "while", "for", "else", "return"]) and '(' not in unit_stripped:
-                    # 检查是否包含初始化（包含=号）
-                    if '=' in unit_stripped:
-                        self.log(f"识别带初始化的变量声明: {unit} → 不跳过，将作为赋值处理")
-                        return False  # 不跳过，让后续逻辑将其识别为赋值
-                    self.log(f"识别变量声明: {unit} → 跳过")
-                    return True
+        if unit_stripped.startswith(_TYPE_KEYWORD_PREFIXES) or unit_stripped in self.TYPE_KEYWORDS:
+            # 排除控制结构（if/while等）和函数调用
+            if not any(kw in unit_stripped for kw in _CONTROL_KEYWORDS) and '(' not in unit_stripped:
+                # 检查是否包含初始化（包含=号）
+                if '=' in unit_stripped:
+                    self.log(f"识别带初始化的变量声明: {unit} → 不跳过，将作为赋值处理")
+                    return False  # 不跳过，让后续逻辑将其识别为赋值
+                self.log(f"识别变量声明: {unit} → 跳过")
+                return True
 
         # 3. 函数声明（带()且无{}，非函数定义）
         # 函数声明通常有返回类型前缀，如: int add(int a, int b);
         # 函数调用没有返回类型前缀，如: add(a, b);
         if '(' in unit_stripped and ')' in unit_stripped and '{' not in unit_stripped:
             # 排除控制结构（if(...)、while(...)等）
-            excluded_keywords = ["if", "while", "for", "else", "switch", "return",
-                               "scanf", "fscanf", "cin", "getline", "getchar",
-                               "cout", "printf", "puts", "putchar", "scanf_s",
-                               "print_s", "put", "fputs", "get"]
-            
-            is_excluded = any(unit_stripped.startswith(kw) for kw in excluded_keywords)
+            is_excluded = unit_stripped.startswith(_DECL_EXCLUDED_PREFIXES)
             
             if not is_excluded:
                 # 检查是否有类型关键字前缀（函数声明的特征）
@@ -392,31 +440,51 @@ class CppToJsonConverter:
             current_idx += 1
         return -1
 
+    def node_has_input(self, node):
+        """
+        判断单个节点自身是否为输入（不含子节点）
+        node: 已解析的节点
+        返回: True=含输入函数，False=不含
+        """
+        # 1. 检查当前节点是否为输入i/o节点（原逻辑已标记）
+        if node.get("tag") == TAG_IO and TRANS_INPUT_X in node.get("translated", ""):
+            return True
+
+        # 2. 检查原始单元是否含输入函数特征（防止漏判未标记的输入）
+        original_unit = node.get("original_unit", "").replace(" ", "")
+        return any(pattern in original_unit for pattern in self.INPUT_PATTERNS)
+
+    def mark_has_input(self, node):
+        """
+        自底向上标记节点是否含输入：节点自身为输入，或其子块中任一子节点已被标记
+        子块内的节点在递归解析时已完成标记，因此无需再次遍历整棵子树
+        """
+        has_input = self.node_has_input(node) or any(
+            child.get("_has_input", False)
+            for child_block in node.get("children", [])
+            for child in child_block.get("children", [])
+        )
+        node["_has_input"] = has_input
+        return has_input
+
     def has_input_in_loop(self, loop_child_nodes):
         """
-        递归检查循环体内是否包含输入函数（cin/scanf/get等）
+        检查循环体内是否包含输入函数（cin/scanf等），读取解析时已传播的标记
         loop_child_nodes: 循环体的子节点列表（含嵌套块）
         返回: True=含输入函数，False=不含
         """
         for node in loop_child_nodes:
-            # 1. 检查当前节点是否为输入i/o节点（原逻辑已标记）
-            if node.get("tag") == "i/o" and "输入变量x" in node.get("translated", ""):
-                self.log(f"循环体内发现输入节点: {node['original_unit']}")
-                return True
-
-            # 2. 检查原始单元是否含输入函数特征（防止漏判未标记的输入）
-            original_unit = node.get("original_unit", "").replace(" ", "")
-            if any(pattern in original_unit for pattern in self.INPUT_PATTERNS):
-                self.log(f"循环体内发现输入函数: {node['original_unit']}")
+            if node.get("_has_input", False):
+                self.log(f"循环体内发现输入: {node['original_unit']}")
                 return True
+        return False
 
-            # 3. 递归检查嵌套子节点（如if块、嵌套循环内的输入）
+    def strip_has_input(self, nodes):
+        """移除解析过程中附加的 _has_input 标记，保持输出JSON结构不变"""
+        for node in nodes:
+            node.pop("_has_input", None)
             for child_block in node.get("children", []):
-                grand_children = child_block.get("children", [])
-                if self.has_input_in_loop(grand_children):
-                    return True
-
-        return False
+                self.strip_has_input(child_block.get("children", []))
 
     def parse_units(self, units, start_idx=0, end_idx=None):
         """递归解析单元：跳过所有声明，只记录执行语句；循环含输入则仅记“输入变量x”"""
@@ -433,6 +501,18 @@ class CppToJsonConverter:
 
             self.log(f"\n处理单元[{current_idx}]: {unit}")
 
+            # 1. 块标记（{/}）：由拆分阶段单独产出的单字符单元，优先判断，
+            # 无需再经过声明识别等字符串处理
+            if len(unit) == 1 and unit in '{}':
+                nodes.append({
+                    "original_unit": unit,
+                    "translated": unit,
+                    "tag": TAG_BLOCK,
+                    "children": []
+                })
+                current_idx += 1
+                continue
+
             # 核心逻辑：跳过所有声明单元，不记录不翻译
             if self.is_declaration(unit):
                 current_idx += 1
@@ -446,19 +526,11 @@ class CppToJsonConverter:
                 "children": []
             }
 
-            # 1. 块标记（{/}）
-            if unit in ('{', '}'):
-                node["translated"] = unit
-                node["tag"] = "block"
-                nodes.append(node)
-                current_idx += 1
-                continue
-
             # 2. 输入函数（cin/scanf等）
             input_patterns = ["scanf(", "fscanf(", "cin>>", "std::cin>>", "getline(", "getchar("]
             if any(pattern in unit.replace(" ", "") for pattern in input_patterns) and not self.in_string_context(unit):
-                node["translated"] = "输入变量x"
-                node["tag"] = "i/o"
+                node["translated"] = TRANS_INPUT_X
+                node["tag"] = TAG_IO
                 nodes.append(node)
                 current_idx += 1
                 continue
@@ -475,7 +547,7 @@ class CppToJsonConverter:
                     node["translated"] = f"输出\"{content}\"" if content else "输出内容"
                 else:
                     node["translated"] = "输出内容"
-                node["tag"] = "i/o"
+                node["tag"] = TAG_IO
                 nodes.append(node)
                 current_idx += 1
                 continue
@@ -484,7 +556,7 @@ class CppToJsonConverter:
             if (unit.startswith(("if(", "if (")) and not self.in_string_context(unit)):
                 condition = self.extract_condition(unit, "if")
                 node["translated"] = f"是否{condition}"
-                node["tag"] = "branch"
+                node["tag"] = TAG_BRANCH
 
                 if current_idx + 1 <= end_idx and units[current_idx + 1] == '{':
                     brace_start = current_idx + 1
@@ -525,7 +597,7 @@ class CppToJsonConverter:
                 case_children = self.parse_switch_cases(units, brace_start + 1, brace_end - 1)
 
                 node["translated"] = f"多分支：{expr}" if expr else "多分支"
-                node["tag"] = "branch"
+                node["tag"] = TAG_BRANCH
                 node["children"] = case_children
                 nodes.append(node)
 
@@ -540,7 +612,7 @@ class CppToJsonConverter:
                     node["translated"] = f"否则当{condition}时"
                 else:
                     node["translated"] = "否则"
-                node["tag"] = "branch"
+                node["tag"] = TAG_BRANCH
 
                 if current_idx + 1 <= end_idx and units[current_idx + 1] == '{':
                     brace_start = current_idx + 1
@@ -565,7 +637,7 @@ class CppToJsonConverter:
                 judge_node = {
                     "original_unit": unit,  # 保留原while语句用于追溯
                     "translated": f"判断：{condition}",  # 明确标记为判断
-                    "tag": "loop",  # 新增判断节点标签，区分普通节点
+                    "tag": TAG_LOOP,  # 新增判断节点标签，区分普通节点
                     "children": []  # 子节点存放真/假分支（此处仅需真分支：循环块）
                 }
 
@@ -583,14 +655,14 @@ class CppToJsonConverter:
                 # 步骤3：检查循环块内是否含输入，决定节点类型
                 has_input = self.has_input_in_loop(child_nodes)
                 # 计算循环体内的语句数量（排除块标记节点）
-                statement_count = sum(1 for node in child_nodes if node.get("tag") != "block")
+                statement_count = sum(1 for node in child_nodes if node.get("tag") != TAG_BLOCK)
                 
                 if has_input and statement_count <= 3:
                     # 含输入且语句数不超过3个：不生成循环结构，仅记录输入节点
                     input_node = {
                         "original_unit": unit,
-                        "translated": "输入变量x",
-                        "tag": "i/o",
+                        "translated": TRANS_INPUT_X,
+                        "tag": TAG_IO,
                         "children": []
                     }
                     nodes.append(input_node)
@@ -600,7 +672,7 @@ class CppToJsonConverter:
                     if child_nodes:
                         judge_node["children"].append({
                             "type": "while_true_block",  # 标记为while判断的真分支
-                            "translated": "循环体（判断为真时执行）",  # 明确分支含义
+                            "translated": TRANS_LOOP_BODY,  # 明确分支含义
                             "children": child_nodes
                         })
                     # 将判断节点加入主节点列表（判断为父，块为子）
@@ -618,7 +690,7 @@ class CppToJsonConverter:
                 judge_node = {
                     "original_unit": unit,  # 保留原for语句（含初始化和迭代）
                     "translated": f"判断：{condition}（for循环）",  # 明确for循环的判断
-                    "tag": "condition",  # 统一判断节点标签
+                    "tag": TAG_CONDITION,  # 统一判断节点标签
                     "children": []
                 }
 
@@ -635,14 +707,14 @@ class CppToJsonConverter:
                 # 步骤3：检查循环块内是否含输入，决定节点类型
                 has_input = self.has_input_in_loop(child_nodes)
                 # 计算循环体内的语句数量（排除块标记节点）
-                statement_count = sum(1 for node in child_nodes if node.get("tag") != "block")
+                statement_count = sum(1 for node in child_nodes if node.get("tag") != TAG_BLOCK)
                 
                 if has_input and statement_count <= 3:
                     # 含输入且语句数不超过3个：替换为输入节点
                     input_node = {
                         "original_unit": unit,
-                        "translated": "输入变量x",
-                        "tag": "i/o",
+                        "translated": TRANS_INPUT_X,
+                        "tag": TAG_IO,
                         "children": []
                     }
                     nodes.append(input_node)
@@ -652,7 +724,7 @@ class CppToJsonConverter:
                     if child_nodes:
                         judge_node["children"].append({
                             "type": "for_block",  # 标记为for判断的真分支
-                            "translated": "循环体（判断为真时执行）",
+                            "translated": TRANS_LOOP_BODY,
                             "children": child_nodes
                         })
                     nodes.append(judge_node)
@@ -666,7 +738,7 @@ class CppToJsonConverter:
             if unit.startswith("return") and not self.in_string_context(unit):
                 return_val = unit.split('return', 1)[1].strip().rstrip(';').strip()
                 node["translated"] = f"返回{return_val}" if return_val else "返回"
-                node["tag"] = "statement"
+                node["tag"] = TAG_STMT
                 nodes.append(node)
                 current_idx += 1
                 continue
@@ -674,27 +746,15 @@ class CppToJsonConverter:
             # 9. 函数调用（在main中调用其他函数）
             # 识别模式：函数名(...) 但排除已处理的特殊函数和控制结构
             if '(' in unit and ')' in unit and not self.in_string_context(unit):
-                # 排除控制结构和已处理的I/O函数
-                excluded_keywords = ["if", "while", "for", "else", "switch", "return",
-                                   "scanf", "fscanf", "cin", "getline", "getchar",
-                                   "cout", "printf", "puts", "putchar"]
-                
-                # 检查是否以排除的关键字开头
-                is_excluded = False
-                for kw in excluded_keywords:
-                    if unit.strip().startswith(kw):
-                        is_excluded = True
-                        break
-                
-                # 如果不是排除的关键字，则识别为函数调用
-                if not is_excluded:
+                # 排除控制结构和已处理的I/O函数（检查是否以排除的关键字开头）
+                if not unit.startswith(_CALL_EXCLUDED_PREFIXES):
                     # 提取函数名（括号前的部分）
                     func_name_match = unit.strip().split('(')[0].strip()
                     # 移除可能的类型前缀（如果有的话）
                     func_name = func_name_match.split()[-1] if func_name_match else "未知函数"
                     
                     node["translated"] = f"调用{func_name}函数"
-                    node["tag"] = "statement"
+                    node["tag"] = TAG_STMT
                     nodes.append(node)
                     self.log(f"识别函数调用: {unit} → 调用{func_name}函数")
                     current_idx += 1
@@ -708,7 +768,7 @@ class CppToJsonConverter:
                 # 排除包含比较运算符的情况
                 if not any(op in unit for op in ['==', '!=', '<=', '>=']):
                     # 检查是否包含控制结构关键字
-                    if not any(kw in unit for kw in ["if", "while", "for", "else", "return"]):
+                    if not any(kw in unit for kw in _CONTROL_KEYWORDS):
                         has_assignment = True
             
             if has_assignment:
@@ -718,7 +778,7 @@ class CppToJsonConverter:
                     node["translated"] = f'把"{right_value}"赋值到"{left_var}"'
                 else:
                     node["translated"] = "变量赋值"
-                node["tag"] = "statement"
+                node["tag"] = TAG_STMT
                 nodes.append(node)
                 self.log(f"识别赋值语句: {unit} → {node['translated']}")
                 current_idx += 1
@@ -726,10 +786,14 @@ class CppToJsonConverter:
 
             # 11. 其他非声明执行语句（保留原句）
             node["translated"] = unit
-            node["tag"] = "statement"
+            node["tag"] = TAG_STMT
             nodes.append(node)
             current_idx += 1
 
+        # 本层节点的子块已在递归中标记完毕，这里只需标记本层节点
+        for node in nodes:
+            self.mark_has_input(node)
+
         return nodes
 
     def process_main_only(self, units):
@@ -757,7 +821,7 @@ class CppToJsonConverter:
         return {
             "original_unit": f"function {func_name}",
             "translated": f"{func_name} 函数",
-            "tag": "statement",
+            "tag": TAG_STMT,
             "children": []
         }
 
@@ -790,24 +854,34 @@ class CppToJsonConverter:
         return functions
 
     def convert(self, formatted_cpp_path, output_json_path):
-        """主转换流程：跳过所有声明，只输出执行语句"""
+        """主转换流程：跳过所有声明，只输出执行语句
+
+        返回写入output.json的数据（节点列表或多函数字典），失败时返回None
+        """
         try:
-            with open(formatted_cpp_path, 'r', encoding='utf-8') as f:
-                formatted_code = f.read()
+            formatted_code = Path(formatted_cpp_path).read_bytes().decode('utf-8')
+            # 与文本模式读取保持一致：统一换行符
+            if '\r' in formatted_code:
+                formatted_code = formatted_code.replace('\r\n', '\n').replace('\r', '\n')
             self.log("文件读取成功")
         except Exception as e:
             logger.error(f"读取文件失败：{e}")
-            return
+            return None
 
-        units = self.split_into_units(formatted_code)
+        # 单元需要按索引随机访问（括号匹配、递归解析子区间），这里一次性收集生成器结果，
+        # 随后释放源码字符串，避免源码与单元列表同时驻留内存
+        units = list(self.split_into_units(formatted_code))
+        del formatted_code
         if not units:
             logger.error("未解析到有效代码单元")
-            return
+            return None
 
         multi_function_enabled = get_config('parser', 'multi_function', default=False)
 
         if multi_function_enabled:
             functions = self.process_all_functions(units)
+            for function in functions:
+                self.strip_has_input(function['nodes'])
             main_entry = next((f for f in functions if f['name'] == 'main'), None)
             main_nodes = deepcopy(main_entry['nodes']) if main_entry else []
             other_functions = [
@@ -820,23 +894,39 @@ class CppToJsonConverter:
             }
         else:
             main_nodes = self.process_main_only(units)
+            self.strip_has_input(main_nodes)
             output_payload = main_nodes
 
         try:
             with open(output_json_path, 'w', encoding='utf-8') as f:
-                json.dump(output_payload, f, ensure_ascii=False, indent=2)
+                if json_utils.orjson is not None:
+                    # orjson 一次性序列化整棵树仍远快于逐子树的标准库输出
+                    json_utils.dump_json(output_payload, f)
+                else:
+                    _stream_json(f, output_payload)
             logger.info(f"JSON转换完成，保存至：{output_json_path}")
         except Exception as e:
             logger.error(f"保存JSON失败：{e}")
 
-def main():
+        return output_payload
+
+def main(return_payload=False):
+    """
+    格式化源文件并转换为output.json
+
+    Args:
+        return_payload: 为True时返回 (格式化结果, 转换数据)，调用方可直接使用转换数据而无需重新读取output.json
+
+    Returns:
+        格式化后的代码内容（失败时为False/None）；return_payload为True时为二元组
+    """
     DEBUG = True
     input_file_path = 'Cfile_formatted.cpp'
     output_file_path = 'output.json'
     from C_FIXED import main
     result = main(create_file=True)
     if result==False:
-        return False
+        return (False, None) if return_payload else False
     if not DEBUG and len(sys.argv) == 3:
         input_file_path = sys.argv[1]
         output_file_path = sys.argv[2]
@@ -845,7 +935,9 @@ def main():
             sys.exit(1)
 
     converter = CppToJsonConverter(debug=DEBUG)
-    converter.convert(input_file_path, output_file_path)
+    payload = converter.convert(input_file_path, output_file_path)
+    if return_payload:
+        return result, payload
     return result
 
 if __name__ == "__main__":
@@ -16,155 +16,157 @@ import json
 
 import re
 
-from copy import deepcopy
-
 
 
 from FlowchartCreateTool import FlowchartConverter
 
-from logger.logger import logger
+from logger.logger import logger, DEBUG
 
 from utils.config_manager import get_config
 
+from utils.json_utils import load_json, dump_json, dumps_json
 
 
 
 
-def main():
 
-    """主函数：执行转换"""
+# 后缀中需要替换为下划线的字符
 
-    # 读取input.json文件
+_SANITIZE_RE = re.compile(r'[^0-9A-Za-z_]+')
 
-    from JSON_transfer import main as json_transfer_main
 
-    result = json_transfer_main()
 
-    if not result:
+# 不能作为结束节点文本的翻译
 
-        return False
+_INVALID_END_TEXTS = frozenset({'{', '}', '开始', '结束'})
 
-    
 
-    input_file_path = './output.json'
 
-    output_file_path = './output_flowchart.json'
 
-    
 
-    try:
+def _clone_json(value):
 
-        with open(input_file_path, 'r', encoding='utf-8') as f:
+    """复制纯JSON结构（dict/list/标量），比deepcopy少了memo字典与类型分派的开销"""
 
-            input_json = json.load(f)
+    value_type = type(value)
 
-        
+    if value_type is dict:
 
-        multi_function_enabled = get_config('parser', 'multi_function', default=False)
+        return {key: _clone_json(item) for key, item in value.items()}
 
-        function_offset_x = get_config('layout', 'function_offset_x', default=450)
+    if value_type is list:
 
+        return [_clone_json(item) for item in value]
 
+    return value
 
-        def sanitize_suffix(name: str) -> str:
 
-            if not name:
 
-                return 'func'
 
-            return re.sub(r'[^0-9A-Za-z_]+', '_', name)
 
+def main():
 
+    """主函数：执行转换"""
 
-        def add_suffix(output_data, suffix: str):
+    # 生成output.json，并直接取回内存中的解析结果，避免写盘后再读回解析
 
-            suffix = sanitize_suffix(suffix)
+    from JSON_transfer import main as json_transfer_main
 
-            id_map = {}
+    result, input_json = json_transfer_main(return_payload=True)
 
-            for node in output_data['items']:
+    if not result:
 
-                old_id = node['id']
+        return False
 
-                new_id = f"{old_id}_{suffix}"
+    
 
-                id_map[old_id] = new_id
+    input_file_path = './output.json'
 
-                node['id'] = new_id
+    output_file_path = './output_flowchart.json'
 
-            for conn in output_data['connections']:
+    
 
-                if conn['start_item_id'] in id_map:
+    try:
 
-                    conn['start_item_id'] = id_map[conn['start_item_id']]
+        # 未取得解析结果时（转换失败）仍按原逻辑读取output.json
 
-                if conn['end_item_id'] in id_map:
+        if input_json is None:
 
-                    conn['end_item_id'] = id_map[conn['end_item_id']]
+            with open(input_file_path, 'r', encoding='utf-8') as f:
 
+                input_json = load_json(f)
 
+        
 
-        def shift_positions(items, dx: float, dy: float):
+        multi_function_enabled = get_config('parser', 'multi_function', default=False)
 
-            for node in items:
+        function_offset_x = get_config('layout', 'function_offset_x', default=450)
 
-                node['x'] += dx
 
-                node['y'] += dy
 
+        def sanitize_suffix(name: str) -> str:
 
+            if not name:
 
-        def get_last_translated_text(nodes):
+                return 'func'
 
-            def is_valid_translation(text_value: str) -> bool:
+            # C函数名本身就是ASCII标识符，无需替换
 
-                if not text_value:
+            if name.isascii() and name.isidentifier():
 
-                    return False
+                return name
 
-                stripped = text_value.strip()
+            return _SANITIZE_RE.sub('_', name)
 
-                if not stripped:
 
-                    return False
 
-                if stripped in {'{', '}', '开始', '结束'}:
+        def add_suffix(output_data, suffix: str):
 
-                    return False
+            suffix_text = f"_{sanitize_suffix(suffix)}"
 
-                return True
+            # 新ID为原ID加固定后缀，只需记录原ID集合，不必构建新旧ID映射
 
+            item_ids = set()
 
+            for node in output_data['items']:
 
-            for node in reversed(nodes):
+                item_ids.add(node['id'])
 
-                if not isinstance(node, dict):
+                node['id'] += suffix_text
 
-                    continue
+            for conn in output_data['connections']:
 
-                if node.get('tag') == 'block':
+                if conn['start_item_id'] in item_ids:
 
-                    continue
+                    conn['start_item_id'] += suffix_text
 
-                translated = node.get('translated', '')
+                if conn['end_item_id'] in item_ids:
 
-                original_unit = node.get('original_unit', '')
+                    conn['end_item_id'] += suffix_text
 
-                if original_unit.startswith('function '):
 
-                    continue
 
-                if not is_valid_translation(translated):
+        def shift_positions(items, dx: float, dy: float):
 
-                    continue
+            # 首个函数不需要平移，直接跳过整表遍历
 
-                stripped_translated = translated.strip()
+            if not dx and not dy:
 
-                if stripped_translated.startswith('返回'):
+                return
 
-                    return stripped_translated
+            for node in items:
+
+                node['x'] += dx
 
+                node['y'] += dy
+
+
+
+        def get_last_translated_text(nodes):
 
+            """倒序单次扫描：优先返回最后一条“返回”语句，否则返回最后一条有效翻译"""
+
+            fallback = None
 
             for node in reversed(nodes):
 
@@ -176,23 +178,25 @@ def main():
 
                     continue
 
-                translated = node.get('translated', '')
-
-                original_unit = node.get('original_unit', '')
-
-                if original_unit.startswith('function '):
+                if node.get('original_unit', '').startswith('function '):
 
                     continue
 
-                if not is_valid_translation(translated):
+                stripped_translated = (node.get('translated', '') or '').strip()
+
+                if not stripped_translated or stripped_translated in _INVALID_END_TEXTS:
 
                     continue
 
-                return translated.strip()
+                if stripped_translated.startswith('返回'):
+
+                    return stripped_translated
 
+                if fallback is None:
 
+                    fallback = stripped_translated
 
-            return None
+            return fallback
 
 
 
@@ -218,57 +222,67 @@ def main():
 
 
 
-            end_ids = {node.get('id') for node in end_nodes}
+            # 原地过滤：元素与连接必定带有id字段，直接下标访问
+
+            end_ids = frozenset(node['id'] for node in end_nodes)
 
-            output_data['items'] = [node for node in items if node.get('id') not in end_ids]
+            items[:] = [node for node in items if node['id'] not in end_ids]
 
-            output_data['connections'] = [
+            connections = output_data.setdefault('connections', [])
 
-                conn for conn in output_data.get('connections', [])
+            connections[:] = [
 
-                if conn.get('start_item_id') not in end_ids and conn.get('end_item_id') not in end_ids
+                conn for conn in connections
+
+                if conn['start_item_id'] not in end_ids and conn['end_item_id'] not in end_ids
 
             ]
 
 
 
-        def compute_max_x(items):
+        def compute_bounds(items):
+
+            """单次遍历计算 (最小x, 最大右边界x, 开始节点y)"""
 
             if not items:
 
-                return -4600.0
+                return -4600.0, -4600.0, -4800.0
 
-            return max(node['x'] + node.get('width', 0) for node in items)
+            min_x = float('inf')
 
+            max_x = float('-inf')
 
+            start_y = None
 
-        def compute_min_x(items):
+            for node in items:
 
-            if not items:
+                x = node['x']
 
-                return -4600.0
+                if x < min_x:
 
-            return min(node['x'] for node in items)
+                    min_x = x
 
+                right = x + node.get('width', 0)
 
+                if right > max_x:
 
-        def find_start_y(items):
+                    max_x = right
 
-            for node in items:
+                if start_y is None and node.get('type') == 'start':
 
-                if node.get('type') == 'start':
+                    start_y = node.get('y', -4800.0)
 
-                    return node.get('y', -4800.0)
+            return min_x, max_x, (start_y if start_y is not None else -4800.0)
 
-            return -4800.0
 
 
+        def convert_nodes(nodes, *, copy=True):
 
-        def convert_nodes(nodes):
+            """转换节点列表；转换过程会在语句上写入 _context_type 等内部标记，调用方不再使用原数据时可传 copy=False 省去复制"""
 
             converter = FlowchartConverter()
 
-            return converter.convert(deepcopy(nodes))
+            return converter.convert(_clone_json(nodes) if copy else nodes)
 
 
 
@@ -292,18 +306,16 @@ def main():
 
             if main_nodes:
 
-                main_output = convert_nodes(main_nodes)
+                main_output = convert_nodes(main_nodes, copy=False)
                 apply_end_node_policy(main_output, get_last_translated_text(main_nodes))
 
                 # 主函数保持默认结束节点
 
-                aggregated_items = deepcopy(main_output['items'])
+                aggregated_items = _clone_json(main_output['items'])
 
-                aggregated_connections = deepcopy(main_output['connections'])
+                aggregated_connections = _clone_json(main_output['connections'])
 
-                overall_max_x = compute_max_x(aggregated_items)
-
-                base_start_y = find_start_y(aggregated_items)
+                _, overall_max_x, base_start_y = compute_bounds(aggregated_items)
 
             else:
 
@@ -323,7 +335,7 @@ def main():
 
 
 
-                func_output = convert_nodes(func_nodes)
+                func_output = convert_nodes(func_nodes, copy=False)
                 apply_end_node_policy(func_output, get_last_translated_text(func_nodes))
                 suffix = func.get('name') or f'func_{index}'
                 add_suffix(func_output, suffix)
@@ -342,7 +354,7 @@ def main():
 
 
 
-                func_min_x = compute_min_x(func_items)
+                func_min_x, func_max_x, func_start_y = compute_bounds(func_items)
 
                 target_start_x = overall_max_x + function_offset_x if aggregated_items else func_min_x
 
@@ -350,8 +362,6 @@ def main():
 
 
 
-                func_start_y = find_start_y(func_items)
-
                 target_start_y = base_start_y if aggregated_items else func_start_y
 
                 dy = target_start_y - func_start_y
@@ -368,11 +378,17 @@ def main():
 
                 aggregated_connections.extend(func_connections)
 
-                if not had_existing_items:
+                # 平移后的边界可由平移前的边界直接推得，无需重新扫描已聚合的全部元素
 
-                    base_start_y = find_start_y(func_items)
+                if had_existing_items:
 
-                overall_max_x = compute_max_x(aggregated_items)
+                    overall_max_x = max(overall_max_x, func_max_x + dx)
+
+                else:
+
+                    base_start_y = func_start_y + dy
+
+                    overall_max_x = func_max_x + dx
 
 
 
@@ -394,7 +410,11 @@ def main():
 
         
 
-        logger.debug(json.dumps(output_json, indent=2, ensure_ascii=False))
+        # 仅在调试级别开启时才序列化整棵结果树，并使用紧凑格式
+
+        if logger.is_enabled_for(DEBUG):
+
+            logger.debug(dumps_json(output_json, indent=False))
 
         
 
@@ -402,7 +422,7 @@ def main():
 
         with open(output_file_path, 'w', encoding='utf-8') as f:
 
-            json.dump(output_json, f, indent=2, ensure_ascii=False)
+            dump_json(output_json, f)
 
         
 
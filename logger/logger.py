@@ -1,14 +1,41 @@
 import os
+import sys
+import time
+import atexit
 import datetime
+import threading
+
+# 日志级别（数值与标准库 logging 保持一致）
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+
+# 本模块文件路径，定位调用者时用于跳过logger内部的帧
+_THIS_FILE = __file__
+
+_LEVEL_VALUES = {
+    "DEBUG": DEBUG,
+    "INFO": INFO,
+    "WARNING": WARNING,
+    "ERROR": ERROR,
+    "CRITICAL": CRITICAL
+}
 
 class Logger:
-    def __init__(self, max_log_files=20):
+    def __init__(self, max_log_files=20, level=INFO):
         """
         初始化Logger
         
         Args:
             max_log_files: 保留的最大日志文件数量，默认为20
+            level: 最低记录级别，低于该级别的日志直接丢弃，默认为INFO（DEBUG需显式开启）
         """
+        self.level = level
+        # 时间戳缓存：同一秒内的日志复用已格式化的"分:秒"
+        self._last_sec = -1
+        self._last_ts = ""
         # 配置日志目录
         log_dir = "../logs"
         os.makedirs(log_dir, exist_ok=True)
@@ -20,8 +47,10 @@ class Logger:
         current_time = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = os.path.join(log_dir, f"app_{current_time}.log")
         
-        # 创建空日志文件
-        open(self.log_file, 'w').close()
+        # 创建日志文件并保持打开，日志写入走缓冲区，避免每条日志都打开/关闭文件
+        self._fh = open(self.log_file, 'w', encoding='utf-8', buffering=8192)
+        self._lock = threading.Lock()
+        atexit.register(self.close)
         
         # 清理旧日志文件
         self._cleanup_old_logs()
@@ -34,14 +63,10 @@ class Logger:
         清理旧的日志文件，只保留最新的max_log_files个文件
         """
         try:
-            # 获取日志目录中所有的.log文件
-            log_files = []
-            for filename in os.listdir(self.log_dir):
-                if filename.endswith('.log') and filename.startswith('app_'):
-                    filepath = os.path.join(self.log_dir, filename)
-                    # 获取文件的修改时间
-                    mtime = os.path.getmtime(filepath)
-                    log_files.append((filepath, mtime))
+            # 获取日志目录中所有的.log文件（scandir 的 DirEntry 自带路径与缓存的 stat 结果）
+            with os.scandir(self.log_dir) as entries:
+                log_files = [(entry.path, entry.stat().st_mtime) for entry in entries
+                             if entry.name.endswith('.log') and entry.name.startswith('app_')]
             
             # 按照修改时间排序（最新的在前）
             log_files.sort(key=lambda x: x[1], reverse=True)
@@ -60,50 +85,106 @@ class Logger:
             print(f"[WARNING] 清理日志文件时出错: {e}")
     
     def get_caller_info(self):
-        import traceback
-        stack = traceback.extract_stack()
-        # 找到调用logger的实际文件和行号
-        # 跳过前几个帧，因为它们是logger内部的调用
-        for i in range(len(stack) - 2, 0, -1):
-            frame = stack[i]
+        # 直接沿帧链向上查找调用logger的实际文件和行号
+        # 不使用traceback.extract_stack()，避免构造整条调用栈并读取源码行
+        frame = sys._getframe(1)
+        while frame is not None:
+            code_filename = frame.f_code.co_filename
             # 跳过logger自身的文件
-            if frame.filename != __file__:
+            if code_filename != _THIS_FILE:
                 # 确保我们找到了实际调用的文件，而不是中间模块
-                # 检查是否是实际业务文件而不是标准库或其他依赖
-                filename = os.path.basename(frame.filename)
-                # 排除标准库路径和空文件名
+                filename = os.path.basename(code_filename)
+                # 排除空文件名和非.py来源（如交互式输入）
                 if filename and '.py' in filename:
-                    line_number = frame.lineno
-                    return filename, line_number
+                    return filename, frame.f_lineno
+            frame = frame.f_back
         return "unknown", 0
     
-    def log(self, level, message):
+    def set_level(self, level):
+        """
+        设置最低记录级别
+        
+        Args:
+            level: 级别名称（如"INFO"）或级别数值
+        """
+        if isinstance(level, str):
+            level_value = _LEVEL_VALUES.get(level.upper())
+            if level_value is None:
+                # 未知级别回退到默认的INFO，而不是打开全部调试输出
+                self.level = INFO
+                self.warning("未知的日志级别 %r，已使用INFO", level)
+                return
+            level = level_value
+        self.level = level
+    
+    def is_enabled_for(self, level):
+        """
+        判断指定级别的日志是否会被记录，供热点路径在格式化消息前提前判断
+        
+        Args:
+            level: 级别数值（如DEBUG）
+        """
+        return level >= self.level
+    
+    def log(self, level, message, *args):
+        """
+        记录一条日志
+        
+        Args:
+            level: 级别名称
+            message: 日志内容；提供args时作为%格式串，仅在级别启用时才格式化
+            args: 格式化参数
+        """
+        level_value = _LEVEL_VALUES.get(level, INFO)
+        if level_value < self.level:
+            return
+        if args:
+            message = message % args
         filename, line_number = self.get_caller_info()
-        current_time = datetime.datetime.now().strftime("%M:%S")
+        now_sec = int(time.time())
+        if now_sec != self._last_sec:
+            self._last_sec = now_sec
+            self._last_ts = time.strftime("%M:%S", time.localtime(now_sec))
+        current_time = self._last_ts
         # 严格按照要求的格式：filename-line-Debug_Level-Min:Sec-内容
         log_entry = f"{filename}-{line_number}-{level}-{current_time}-{message}\n"
         
-        # 写入日志文件
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        # 写入日志文件（WARNING及以上立即落盘，避免异常退出时丢失）
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.write(log_entry)
+                if level_value >= WARNING:
+                    self._fh.flush()
         
         # 同时输出到控制台（保持原有功能）
         print(f"[{level}] {message}")
     
-    def debug(self, message):
-        self.log("DEBUG", message)
+    def flush(self):
+        """将缓冲区中的日志写入文件"""
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.flush()
+    
+    def close(self):
+        """关闭日志文件（程序退出时自动调用）"""
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+    
+    def debug(self, message, *args):
+        self.log("DEBUG", message, *args)
     
-    def info(self, message):
-        self.log("INFO", message)
+    def info(self, message, *args):
+        self.log("INFO", message, *args)
     
-    def warning(self, message):
-        self.log("WARNING", message)
+    def warning(self, message, *args):
+        self.log("WARNING", message, *args)
     
-    def error(self, message):
-        self.log("ERROR", message)
+    def error(self, message, *args):
+        self.log("ERROR", message, *args)
     
-    def critical(self, message):
-        self.log("CRITICAL", message)
+    def critical(self, message, *args):
+        self.log("CRITICAL", message, *args)
 
 # 创建全局logger实例
 logger = Logger()
@@ -1,23 +1,43 @@
 """颜色工具函数"""
 
-from typing import Dict, List, Optional
-
-from PyQt6.QtGui import QColor
-
-
-COLOR_PRESETS: Dict[str, List[int]] = {
-    "柔和灰": [240, 240, 240],
-    "纯白": [255, 255, 255],
-    "浅灰": [230, 230, 230],
-    "深灰": [200, 200, 200],
-    "天空蓝": [200, 230, 255],
-    "浅蓝": [220, 235, 255],
-    "薄荷绿": [220, 255, 235],
-    "淡粉": [255, 230, 240],
-    "浅黄": [255, 247, 220],
-    "浅紫": [235, 220, 255]
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from PyQt6.QtGui import QColor
+
+# QColor 在需要时才从 PyQt6 导入：只用到预设表、名称查询等纯数据函数时无需加载Qt
+__all__ = ['COLOR_PRESETS', 'normalize_color', 'to_qcolor', 'find_color_name',
+           'get_palette_names', 'get_palette_color']
+
+
+# 预设颜色使用不可变元组，外部无法通过返回值改动共享的预设
+COLOR_PRESETS: Dict[str, Tuple[int, int, int]] = {
+    "柔和灰": (240, 240, 240),
+    "纯白": (255, 255, 255),
+    "浅灰": (230, 230, 230),
+    "深灰": (200, 200, 200),
+    "天空蓝": (200, 230, 255),
+    "浅蓝": (220, 235, 255),
+    "薄荷绿": (220, 255, 235),
+    "淡粉": (255, 230, 240),
+    "浅黄": (255, 247, 220),
+    "浅紫": (235, 220, 255)
 }
 
+# RGB 到预设名称的反向索引，find_color_name 按元组直接查表
+_RGB_TO_NAME: Dict[Tuple[int, int, int], str] = {rgb: name for name, rgb in COLOR_PRESETS.items()}
+
+
+def _lookup_preset(name: str) -> Optional[Tuple[int, int, int]]:
+    """按名称查找预设颜色；名称通常不带空白，先直接查找，未命中且确有首尾空白时再strip重查"""
+    preset = COLOR_PRESETS.get(name)
+    if preset is None:
+        stripped = name.strip()
+        if stripped != name:
+            preset = COLOR_PRESETS.get(stripped)
+    return preset
+
 
 def normalize_color(value, default: Optional[List[int]] = None) -> List[int]:
     """将各种格式的颜色值转换为 RGB 列表"""
@@ -25,40 +45,64 @@ def normalize_color(value, default: Optional[List[int]] = None) -> List[int]:
         default = [255, 255, 255]
 
     if isinstance(value, list) and len(value) == 3:
-        return [int(v) for v in value]
-
-    if isinstance(value, QColor):
-        return [value.red(), value.green(), value.blue()]
+        r, g, b = value
+        if type(r) is int and type(g) is int and type(b) is int:
+            # 配置中的颜色通常已是整数列表：只做浅拷贝，免去三次int()转换
+            return value[:]
+        return [int(r), int(g), int(b)]
 
     if isinstance(value, str):
-        preset = COLOR_PRESETS.get(value.strip())
+        preset = _lookup_preset(value)
         if preset:
-            return preset
+            return list(preset)
+
+        # 尝试解析 "r,g,b" 字符串（int() 本身会忽略首尾空白，无需逐段strip）
+        r, sep, rest = value.partition(',')
+        if sep:
+            g, sep, b = rest.partition(',')
+            if sep and ',' not in b:
+                try:
+                    return [int(r), int(g), int(b)]
+                except ValueError:
+                    pass
+
+        return default
 
-        # 尝试解析 "r,g,b" 字符串
-        parts = value.split(',')
-        if len(parts) == 3:
-            try:
-                return [int(p.strip()) for p in parts]
-            except ValueError:
-                pass
+    if value is not None:
+        from PyQt6.QtGui import QColor
+        if isinstance(value, QColor):
+            return [value.red(), value.green(), value.blue()]
 
     return default
 
 
-def to_qcolor(value, default: Optional[List[int]] = None) -> QColor:
-    """转换为 QColor"""
-    rgb = normalize_color(value, default)
-    return QColor(*rgb)
+@lru_cache(maxsize=128)
+def _qcolor_from_rgb(r: int, g: int, b: int) -> 'QColor':
+    """按RGB缓存 QColor 实例（仅在GUI线程调用）"""
+    from PyQt6.QtGui import QColor
+    return QColor(r, g, b)
+
+
+def to_qcolor(value, default: Optional[List[int]] = None) -> 'QColor':
+    """
+    转换为 QColor
+
+    相同颜色返回同一个缓存的 QColor 实例，调用方应视为只读（需要修改时先复制 QColor(color)）。
+    """
+    if isinstance(value, str):
+        # 预设名称直接用元组查缓存，不经过列表
+        preset = _lookup_preset(value)
+        if preset:
+            return _qcolor_from_rgb(*preset)
+    r, g, b = normalize_color(value, default)
+    return _qcolor_from_rgb(int(r), int(g), int(b))
 
 
 def find_color_name(rgb_list: List[int]) -> Optional[str]:
     """根据 RGB 列表查找预设名称"""
-    target = [int(v) for v in rgb_list]
-    for name, rgb in COLOR_PRESETS.items():
-        if rgb == target:
-            return name
-    return None
+    if len(rgb_list) != 3:
+        return None
+    return _RGB_TO_NAME.get((int(rgb_list[0]), int(rgb_list[1]), int(rgb_list[2])))
 
 
 def get_palette_names() -> List[str]:
@@ -67,6 +111,6 @@ def get_palette_names() -> List[str]:
 
 
 def get_palette_color(name: str) -> List[int]:
-    """根据名称获取颜色 RGB"""
-    return COLOR_PRESETS.get(name, [255, 255, 255])
+    """根据名称获取颜色 RGB（返回新列表，预设本身以元组保存）"""
+    return list(COLOR_PRESETS.get(name, (255, 255, 255)))
 
@@ -1,122 +1,165 @@
 """
 配置管理器 - 读取和管理 config.yaml 配置文件
 """
+import atexit
+import copy
 import os
-import yaml
+import threading
 from pathlib import Path
 from logger.logger import logger
+from utils.yaml_utils import load_yaml, dump_yaml
+
+
+# 值缓存中表示“该键路径不存在”的标记
+_MISSING = object()
+
+# 配置文件路径
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config.yaml"
+
+# 修改配置后延迟写回文件的时间（毫秒），期间的多次修改合并为一次写入
+_SAVE_DELAY_MS = 500
+
+
+# 默认配置（配置文件不存在或加载失败时使用）；只在导入时构造一次，使用时深拷贝，避免调用方改动共享数据
+_DEFAULT_CONFIG = {
+    'window': {
+        'title': '流程图工具',
+        'width': 1200,
+        'height': 800,
+        'x': 100,
+        'y': 100
+    },
+    'scene': {
+        'origin_x': -5000,
+        'origin_y': -5000,
+        'min_width': 1000,
+        'min_height': 1000,
+        'padding': 500,
+        'grid_size': 20,
+        'background_color': [230, 230, 230],
+        'grid_color': [200, 200, 200]
+    },
+    'parser': {
+        'multi_function': False
+    },
+    'item': {
+        'default_width': 125,
+        'default_height': 75,
+        'connection_point': {
+            'radius': 5,
+            'hit_radius': 10,
+            'z_value': 10
+        },
+        'colors': {
+            'default': [240, 240, 240],
+            'start': [240, 240, 240],
+            'end': [240, 240, 240],
+            'input': [240, 240, 240],
+            'process': [240, 240, 240],
+            'decision': [240, 240, 240]
+        }
+    },
+    'connection': {
+        'arrow': {'size': 10},
+        'line': {'width': 2, 'color': 'black', 'z_value': 5},
+        'path_offsets': {
+            'down_to_up': {'mid_offset': 40},
+            'up_to_down': {'down_offset': 30, 'horizontal_ratio': 0.7, 'mid_offset': 40},
+            'horizontal_loop': {'offset': 50},
+            'right_to_up': {'base_spacing': 50, 'dynamic_spacing': 30, 'extra_up_distance': 20},
+            'left_to_up': {'horizontal_offset': 50, 'extra_up_distance': 20},
+            'decision_loop': {'horizontal_offset': 30, 'mid_offset': 40}
+        }
+    },
+    'view': {
+        'zoom': {'in_factor': 1.25, 'out_factor': 0.8, 'min_scale': 0.2},
+        'drag_mode': 'scroll',
+        'opengl': False
+    },
+    'export': {
+        'default_filename': 'C流程图.png',
+        'margin': 30,
+        'min_width': 500,
+        'min_height': 400,
+        'background_color': [255, 255, 255]
+    },
+    'layout': {
+        'function_offset_x': 250
+    },
+    'text': {
+        'font_family': 'Arial',
+        'font_size': 12,
+        'text_margin': 10,
+        'label_font_size': 12
+    },
+    'logging': {
+        'level': 'INFO'
+    },
+    'tips': {
+        'tip_text': '💡 提示：\n1.点击「从代码导入」选择C/C++文件即可自动生成流程图\n2.使用Ctrl+滚轮缩放画布\n3.点击红色点作为连线起点，再点击另一个点作为连线终点',
+        'repo_url': 'https://github.com/PengZhangSDF/AutoC_to_flowchart',
+        'repo_text': '🔗 程序免费开源地址：'
+    }
+}
 
 
 class ConfigManager:
     """配置管理器单例类"""
     
     _instance = None
+    _instance_lock = threading.Lock()
     _config = None
+    # 键路径 -> 配置值（或 _MISSING）的缓存，配置内容变化时清空
+    _value_cache = {}
+    # 内存中的配置是否有尚未写回文件的修改，以及是否已安排延迟写回
+    _save_pending = False
+    _save_scheduled = False
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._instance_lock:
+                # 双重检查：等待锁期间可能已有其他线程创建了实例
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
-        if self._config is None:
-            self.load_config()
+        # 每次 ConfigManager() 都会调用 __init__，只在首次时加载配置
+        if self._initialized:
+            return
+        with self._instance_lock:
+            if not self._initialized:
+                self.load_config()
+                self._initialized = True
     
     def load_config(self):
         """加载配置文件"""
-        config_path = Path(__file__).resolve().parent.parent / "config.yaml"
+        # 先写回尚未保存的修改，避免重新加载时丢失
+        self.flush()
+        config_path = CONFIG_PATH
+        self._value_cache = {}
         
         if not config_path.exists():
             print(f"警告：配置文件 {config_path} 不存在，使用默认配置")
             self._config = self._get_default_config()
-            return
+        else:
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    self._config = load_yaml(f)
+                print(f"✓ 成功加载配置文件: {config_path}")
+            except Exception as e:
+                print(f"警告：加载配置文件失败 ({e})，使用默认配置")
+                self._config = self._get_default_config()
         
-        try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                self._config = yaml.safe_load(f)
-            print(f"✓ 成功加载配置文件: {config_path}")
-        except Exception as e:
-            print(f"警告：加载配置文件失败 ({e})，使用默认配置")
-            self._config = self._get_default_config()
+        # 同步日志级别
+        # 默认INFO：逐项调试输出只在显式把 logging.level 设为 DEBUG 时开启
+        logger.set_level(self.get('logging', 'level', default='INFO'))
     
     def _get_default_config(self):
-        """获取默认配置（如果配置文件不存在）"""
-        return {
-            'window': {
-                'title': '流程图工具',
-                'width': 1200,
-                'height': 800,
-                'x': 100,
-                'y': 100
-            },
-            'scene': {
-                'origin_x': -5000,
-                'origin_y': -5000,
-                'min_width': 1000,
-                'min_height': 1000,
-                'padding': 500,
-                'grid_size': 20,
-                'background_color': [230, 230, 230],
-                'grid_color': [200, 200, 200]
-            },
-            'parser': {
-                'multi_function': False
-            },
-            'item': {
-                'default_width': 125,
-                'default_height': 75,
-                'connection_point': {
-                    'radius': 5,
-                    'hit_radius': 10,
-                    'z_value': 10
-                },
-                'colors': {
-                    'default': [240, 240, 240],
-                    'start': [240, 240, 240],
-                    'end': [240, 240, 240],
-                    'input': [240, 240, 240],
-                    'process': [240, 240, 240],
-                    'decision': [240, 240, 240]
-                }
-            },
-            'connection': {
-                'arrow': {'size': 10},
-                'line': {'width': 2, 'color': 'black', 'z_value': 5},
-                'path_offsets': {
-                    'down_to_up': {'mid_offset': 40},
-                    'up_to_down': {'down_offset': 30, 'horizontal_ratio': 0.7, 'mid_offset': 40},
-                    'horizontal_loop': {'offset': 50},
-                    'right_to_up': {'base_spacing': 50, 'dynamic_spacing': 30, 'extra_up_distance': 20},
-                    'left_to_up': {'horizontal_offset': 50, 'extra_up_distance': 20},
-                    'decision_loop': {'horizontal_offset': 30, 'mid_offset': 40}
-                }
-            },
-            'view': {
-                'zoom': {'in_factor': 1.25, 'out_factor': 0.8, 'min_scale': 0.2},
-                'drag_mode': 'scroll'
-            },
-            'export': {
-                'default_filename': 'C流程图.png',
-                'margin': 30,
-                'min_width': 500,
-                'min_height': 400,
-                'background_color': [255, 255, 255]
-            },
-            'layout': {
-                'function_offset_x': 250
-            },
-            'text': {
-                'font_family': 'Arial',
-                'font_size': 12,
-                'text_margin': 10,
-                'label_font_size': 12
-            },
-            'tips': {
-                'tip_text': '💡 提示：\n1.点击「从代码导入」选择C/C++文件即可自动生成流程图\n2.使用Ctrl+滚轮缩放画布\n3.点击红色点作为连线起点，再点击另一个点作为连线终点',
-                'repo_url': 'https://github.com/PengZhangSDF/AutoC_to_flowchart',
-                'repo_text': '🔗 程序免费开源地址：'
-            }
-        }
+        """获取默认配置（如果配置文件不存在），返回可自由修改的副本"""
+        return copy.deepcopy(_DEFAULT_CONFIG)
     
     def get(self, *keys, default=None):
         """
@@ -129,13 +172,20 @@ class ConfigManager:
         Returns:
             配置值或默认值
         """
-        value = self._config
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        return value
+        try:
+            value = self._value_cache[keys]
+        except KeyError:
+            value = self._config
+            for key in keys:
+                # 只沿字典逐层下降，列表、字符串等值不能再按键索引
+                if isinstance(value, dict):
+                    value = value.get(key, _MISSING)
+                else:
+                    value = _MISSING
+                if value is _MISSING:
+                    break
+            self._value_cache[keys] = value
+        return default if value is _MISSING else value
     
     def reload(self):
         """重新加载配置文件"""
@@ -144,6 +194,7 @@ class ConfigManager:
     def update_in_memory(self, data):
         """使用提供的数据更新内存中的配置副本"""
         self._config = data
+        self._value_cache = {}
 
     def set_value(self, keys, value):
         """更新配置并写回文件"""
@@ -155,28 +206,68 @@ class ConfigManager:
             self._config = self._get_default_config()
 
         current = self._config
+        if not isinstance(current, dict):
+            return False
+        # 下降过程中的每一层都是字典（已有的或新建的），只需检查根节点
         for key in keys[:-1]:
-            if not isinstance(current, dict):
-                return False
             child = current.get(key)
-            if not isinstance(child, dict):
-                current[key] = {}
-            current = current[key]
+            if isinstance(child, dict):
+                current = child
+            else:
+                child = {}
+                current[key] = child
+                current = child
 
-        if not isinstance(current, dict):
-            return False
         current[keys[-1]] = value
-
-        config_path = Path(__file__).resolve().parent.parent / "config.yaml"
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self._config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-        logger.info(f"[ConfigManager] 已写入 {config_path}, 当前parser.multi_function={self._config.get('parser', {}).get('multi_function')}")
+        self._value_cache = {}
+        self.schedule_save()
 
         return True
 
+    def schedule_save(self):
+        """
+        安排将内存中的配置写回文件
+
+        有Qt事件循环时延迟 _SAVE_DELAY_MS 毫秒再写，期间的连续修改只写一次；
+        没有 QApplication（命令行工具、脚本）时立即写入。程序退出时会写回尚未保存的修改。
+        """
+        self._save_pending = True
+        if self._save_scheduled:
+            return
+        try:
+            from PyQt6.QtCore import QCoreApplication, QTimer
+        except ImportError:  # 非GUI环境
+            QCoreApplication = None
+        if QCoreApplication is None or QCoreApplication.instance() is None:
+            self.flush()
+            return
+        self._save_scheduled = True
+        QTimer.singleShot(_SAVE_DELAY_MS, self.flush)
+
+    def flush(self):
+        """立即写回尚未保存的配置修改（先写临时文件再替换，避免中途崩溃损坏 config.yaml）"""
+        self._save_scheduled = False
+        if not self._save_pending:
+            return
+        self._save_pending = False
+
+        temp_path = CONFIG_PATH.with_name(CONFIG_PATH.name + '.tmp')
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                dump_yaml(self._config, f)
+            os.replace(temp_path, CONFIG_PATH)
+        except Exception as e:
+            # 可能在定时器回调中执行，异常不能抛出到Qt事件循环
+            logger.error("[ConfigManager] 写入配置文件失败: %s", e)
+            return
+        logger.info("[ConfigManager] 已写入 %s, 当前parser.multi_function=%s",
+                    CONFIG_PATH, self._config.get('parser', {}).get('multi_function'))
+
 
 # 创建全局配置实例
 config = ConfigManager()
+# 退出前写回仍在等待延迟保存的修改
+atexit.register(config.flush)
 
 
 # 便捷函数
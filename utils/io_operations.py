@@ -1,10 +1,84 @@
 """
 流程图工具的保存和读取功能
 """
-import json
 from PyQt6.QtWidgets import QFileDialog, QMessageBox
 from PyQt6.QtCore import Qt
-from logger.logger import logger
+from logger.logger import logger, DEBUG
+from utils.json_utils import loads_json, dumps_json
+
+# 加载文件时累计出错的元素/连接超过该数量即停止加载（文件很可能已损坏）
+_MAX_LOAD_ERRORS = 50
+
+# GUI类在首次使用时导入并缓存（避免与GUI包循环导入）
+_FlowchartItem = None
+_ConnectionLine = None
+
+
+def _ensure_classes():
+    """
+    返回流程图元素类与连接线类，首次调用时导入
+    
+    Returns:
+        tuple: (FlowchartItem, ConnectionLine)
+    """
+    global _FlowchartItem, _ConnectionLine
+    if _FlowchartItem is None:
+        from GUI import FlowchartItem, ConnectionLine
+        _FlowchartItem = FlowchartItem
+        _ConnectionLine = ConnectionLine
+    return _FlowchartItem, _ConnectionLine
+
+
+def _item_to_dict(item):
+    """
+    提取单个FlowchartItem的保存数据
+
+    Returns:
+        dict: 元素数据；缺少必要属性时返回None
+    """
+    try:
+        # 获取文本（支持两种方式）
+        text_item = getattr(item, 'text_item', None)
+        return {
+            "id": item.id,
+            "type": item.item_type,
+            "x": item.x(),
+            "y": item.y(),
+            # 使用width和height属性而不是rect().width()
+            "width": item.width,
+            "height": item.height,
+            "text": text_item.toPlainText() if text_item else item.text
+        }
+    except AttributeError as e:
+        logger.debug("元素 ✗ 缺少属性: %s", e)
+    except Exception as e:
+        logger.debug("元素 ✗ 访问属性时出错: %s", e)
+    return None
+
+
+def _connection_to_dict(connection):
+    """
+    提取单条连接线的保存数据
+
+    Returns:
+        dict: 连接数据；连接对象无效时返回None
+    """
+    try:
+        # 检查连接对象是否有效
+        if not (hasattr(connection, 'start_item') and hasattr(connection, 'end_item')):
+            logger.debug("连接 ✗ 连接对象无效，缺少必要属性")
+            return None
+        return {
+            "start_item_id": connection.start_item.id,
+            "start_point_type": connection.start_point_type,
+            "end_item_id": connection.end_item.id,
+            "end_point_type": connection.end_point_type,
+            # 检查是否有标签
+            "label": getattr(connection, 'label', None)
+        }
+    except Exception as e:
+        logger.debug("连接 ✗ 收集连接信息失败: %s", e)
+    return None
 
 
 def save_flowchart(scene, parent_window):
@@ -21,101 +95,44 @@ def save_flowchart(scene, parent_window):
     logger.info("=== 开始保存流程图 ===")
 
     try:
-        # 获取所有流程图元素
-        flowchart_items = []
-        connections = []
+        FlowchartItem, _ = _ensure_classes()
+
+        # 调试级别关闭时跳过逐项日志的字符串格式化
+        debug_enabled = logger.is_enabled_for(DEBUG)
 
         # 收集所有元素信息
+        scene_items = scene.items()
         logger.debug("\n=== 收集元素信息 ===")
-        logger.debug(f"场景中的项目数量: {len(scene.items())}")
+        logger.debug("场景中的项目数量: %d", len(scene_items))
 
-        for i, item in enumerate(scene.items()):
-            logger.debug(f"\n项目 {i+1}:")
-            logger.debug(f"  类型: {item.__class__.__name__}")
+        # 只处理FlowchartItem实例，转换失败的元素（返回None）直接过滤掉
+        flowchart_items = [
+            item_data for item_data in map(_item_to_dict, (item for item in scene_items if isinstance(item, FlowchartItem)))
+            if item_data is not None
+        ]
+        if debug_enabled:
+            for item_data in flowchart_items:
+                logger.debug("元素 ✓ ID=%s, 类型=%s, 文本='%s', 位置=(%s, %s), 尺寸=%sx%s",
+                             item_data['id'], item_data['type'], item_data['text'],
+                             item_data['x'], item_data['y'], item_data['width'], item_data['height'])
 
-            # 检查是否为FlowchartItem实例
-            if 'FlowchartItem' in str(item.__class__):
-                logger.debug(f"  ✓ 识别为FlowchartItem")
-
-                try:
-                    # 尝试访问必要的属性
-                    item_id = item.id
-                    item_type = item.item_type
-
-                    # 获取文本（支持两种方式）
-                    if hasattr(item, 'text_item') and item.text_item:
-                        item_text = item.text_item.toPlainText()
-                    else:
-                        item_text = item.text
-
-                    item_x = item.x()
-                    item_y = item.y()
-
-                    # 使用width和height属性而不是rect().width()
-                    item_width = item.width
-                    item_height = item.height
-
-                    logger.debug(f"  ✓ 成功访问所有属性")
-                    logger.debug(f"    - ID: {item_id}")
-                    logger.debug(f"    - 类型: {item_type}")
-                    logger.debug(f"    - 文本: '{item_text}'")
-                    logger.debug(f"    - 位置: ({item_x}, {item_y})")
-                    logger.debug(f"    - 尺寸: {item_width}x{item_height}")
-
-                    # 保存元素信息
-                    flowchart_item = {
-                        "id": item_id,
-                        "type": item_type,
-                        "x": item_x,
-                        "y": item_y,
-                        "width": item_width,
-                        "height": item_height,
-                        "text": item_text
-                    }
-                    flowchart_items.append(flowchart_item)
-
-                except AttributeError as e:
-                    logger.debug(f"  ✗ 缺少属性: {e}")
-                except Exception as e:
-                    logger.debug(f"  ✗ 访问属性时出错: {e}")
-            else:
-                logger.debug(f"  - 跳过非FlowchartItem元素")
-
-        logger.debug(f"\n收集到的元素数量: {len(flowchart_items)}")
+        logger.debug("\n收集到的元素数量: %d", len(flowchart_items))
 
         # 收集所有连接信息
         logger.debug("\n=== 收集连接信息 ===")
-        logger.debug(f"场景中的连接数量: {len(scene.connections)}")
-
-        for i, connection in enumerate(scene.connections):
-            logger.debug(f"\n连接 {i+1}:")
-            try:
-                # 检查连接对象是否有效
-                if hasattr(connection, 'start_item') and hasattr(connection, 'end_item'):
-                    # 检查是否有标签
-                    label = connection.label if hasattr(connection, 'label') else None
-
-                    connection_data = {
-                        "start_item_id": connection.start_item.id,
-                        "start_point_type": connection.start_point_type,
-                        "end_item_id": connection.end_item.id,
-                        "end_point_type": connection.end_point_type,
-                        "label": label
-                    }
-                    connections.append(connection_data)
-
-                    logger.debug(f"  ✓ 成功收集连接信息")
-                    logger.debug(f"    - 起始元素ID: {connection.start_item.id}")
-                    logger.debug(f"    - 起始点类型: {connection.start_point_type}")
-                    logger.debug(f"    - 结束元素ID: {connection.end_item.id}")
-                    logger.debug(f"    - 结束点类型: {connection.end_point_type}")
-                else:
-                    logger.debug(f"  ✗ 连接对象无效，缺少必要属性")
-
-            except Exception as e:
-                logger.debug(f"  ✗ 收集连接信息失败: {e}")
-
-        logger.debug(f"\n收集到的连接数量: {len(connections)}")
+        logger.debug("场景中的连接数量: %d", len(scene.connections))
+
+        connections = [
+            connection_data for connection_data in map(_connection_to_dict, scene.connections)
+            if connection_data is not None
+        ]
+        if debug_enabled:
+            for connection_data in connections:
+                logger.debug("连接 ✓ %s.%s -> %s.%s",
+                             connection_data['start_item_id'], connection_data['start_point_type'],
+                             connection_data['end_item_id'], connection_data['end_point_type'])
+
+        logger.debug("\n收集到的连接数量: %d", len(connections))
 
         # 创建JSON数据
         flowchart_data = {
@@ -124,13 +141,13 @@ def save_flowchart(scene, parent_window):
             "connections": connections
         }
 
-        # 显示要保存的数据
+        # 显示要保存的数据摘要（不在日志中输出整份JSON）
         logger.debug("\n=== 要保存的数据 ===")
-        logger.debug(json.dumps(flowchart_data, indent=2, ensure_ascii=False))
+        logger.debug("version=%s, 元素数量=%d, 连接数量=%d",
+                     flowchart_data["version"], len(flowchart_items), len(connections))
 
         # 显示保存文件对话框
-        file_dialog = QFileDialog()
-        file_path, _ = file_dialog.getSaveFileName(
+        file_path, _ = QFileDialog.getSaveFileName(
             parent_window,
             "保存流程图",
             "",
@@ -146,19 +163,13 @@ def save_flowchart(scene, parent_window):
             file_path += ".json"
 
         try:
-            # 保存到JSON文件
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(flowchart_data, f, indent=2, ensure_ascii=False)
-
-            logger.info(f"\n✓ 成功保存到文件: {file_path}")
+            # 保存到JSON文件（先完整序列化，再一次性写入，避免json.dump逐片段写入）
+            data_str = dumps_json(flowchart_data)
+            # 使用1MiB缓冲区，大文件写入时减少系统调用次数
+            with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(data_str)
 
-            # 验证保存的文件
-            with open(file_path, 'r', encoding='utf-8') as f:
-                saved_data = json.load(f)
-            logger.debug(f"✓ 验证保存的文件:")
-            logger.debug(f"  - 版本: {saved_data.get('version')}")
-            logger.debug(f"  - 元素数量: {len(saved_data.get('items', []))}")
-            logger.debug(f"  - 连接数量: {len(saved_data.get('connections', []))}")
+            logger.info("\n✓ 成功保存到文件: %s", file_path)
 
             QMessageBox.information(parent_window, "保存成功",
                                   f"流程图已成功保存到:\n{file_path}\n\n"
@@ -168,12 +179,12 @@ def save_flowchart(scene, parent_window):
             return True
 
         except Exception as e:
-            logger.debug(f"✗ 保存文件失败: {e}")
+            logger.debug("✗ 保存文件失败: %s", e)
             QMessageBox.warning(parent_window, "保存失败", f"保存文件时出错:\n{str(e)}")
             return False
 
     except Exception as e:
-        logger.debug(f"✗ 保存流程整体失败: {e}")
+        logger.debug("✗ 保存流程整体失败: %s", e)
         import traceback
         traceback.print_exc()
         QMessageBox.warning(parent_window, "保存失败", f"保存流程图时出错:\n{str(e)}")
@@ -193,15 +204,11 @@ def load_flowchart(scene, parent_window, file_path=None):
     logger.info("=== 开始加载流程图 ===")
 
     try:
-        if file_path is None:
-            # 动态导入需要的类
-            logger.debug("尝试导入FlowchartItem和ConnectionLine...")
-            from GUI import FlowchartItem, ConnectionLine
-            logger.debug("✓ 成功导入所需类")
+        FlowchartItem, ConnectionLine = _ensure_classes()
 
+        if file_path is None:
             # 显示打开文件对话框
-            file_dialog = QFileDialog()
-            file_path, _ = file_dialog.getOpenFileName(
+            file_path, _ = QFileDialog.getOpenFileName(
                 parent_window,
                 "打开流程图",
                 "",
@@ -211,18 +218,16 @@ def load_flowchart(scene, parent_window, file_path=None):
             if not file_path:
                 logger.info("用户取消了文件选择")
                 return False
-        else:
-            from GUI import FlowchartItem, ConnectionLine
-        logger.debug(f"选择的文件: {file_path}")
+        logger.debug("选择的文件: %s", file_path)
 
         # 读取JSON文件
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                flowchart_data = json.load(f)
+            # 以二进制一次性读入，直接交给解析器（orjson/json 均可直接解析UTF-8字节）
+            with open(file_path, 'rb') as f:
+                flowchart_data = loads_json(f.read())
             logger.debug("✓ 成功读取JSON文件")
-            # logger.debug(f"文件内容: {json.dumps(flowchart_data, indent=2, ensure_ascii=False)}")
         except Exception as e:
-            logger.debug(f"✗ 读取JSON文件失败: {e}")
+            logger.debug("✗ 读取JSON文件失败: %s", e)
             QMessageBox.warning(parent_window, "读取失败", f"无法读取文件:\n{str(e)}")
             return False
 
@@ -242,127 +247,152 @@ def load_flowchart(scene, parent_window, file_path=None):
             scene.batch_loading = True
             logger.debug("✓ 启用批量加载模式")
 
-        # 创建元素字典，用于快速查找
-        item_dict = {}
+        # 加载期间屏蔽场景信号并暂停视图重绘，全部元素与连接创建完成后统一刷新
+        view = getattr(parent_window, 'view', None)
+        scene.blockSignals(True)
+        if view is not None:
+            view.setUpdatesEnabled(False)
+        try:
+            # 创建元素字典，用于快速查找
+            item_dict = {}
 
-        # 创建元素
-        logger.debug(f"\n=== 加载元素 ===")
-        logger.debug(f"元素数量: {len(flowchart_data['items'])}")
+            # 调试级别关闭时跳过逐项日志的字符串格式化
+            debug_enabled = logger.is_enabled_for(DEBUG)
 
-        for i, item_data in enumerate(flowchart_data["items"]):
-            logger.debug(f"\n加载元素 {i+1}:")
-            logger.debug(f"  数据: {item_data}")
+            # 创建失败的元素/连接数量（用于出错过多时停止加载）与成功创建的数量
+            failed_items = 0
+            failed_connections = 0
+            created_items = 0
+            created_connections = 0
 
-            try:
-                item_type = item_data["type"]
-                x = item_data["x"]
-                y = item_data["y"]
-                width = item_data.get("width", 125)  # 使用与FlowchartItem一致的默认值
-                height = item_data.get("height", 75)  # 使用与FlowchartItem一致的默认值
+            # 创建元素
+            logger.debug("\n=== 加载元素 ===")
+            logger.debug("元素数量: %d", len(flowchart_data['items']))
 
-                # 创建流程图元素
-                item = FlowchartItem(item_type, x, y, width, height)
-                item.id = item_data["id"]
+            # 循环内频繁调用的方法先绑定到局部变量
+            add_item = scene.addItem
+            # 场景支持连接索引时通过 register_connection 登记，保持索引同步
+            append_connection = getattr(scene, 'register_connection', scene.connections.append)
 
-                # 设置文本
-                item_text = item_data.get("text", "")
-                item.setText(item_text)
+            for i, item_data in enumerate(flowchart_data["items"]):
+                try:
+                    item_type = item_data["type"]
+                    x = item_data["x"]
+                    y = item_data["y"]
+                    width = item_data.get("width", 125)  # 使用与FlowchartItem一致的默认值
+                    height = item_data.get("height", 75)  # 使用与FlowchartItem一致的默认值
 
-                scene.addItem(item)
-                item_dict[item.id] = item
+                    # 创建流程图元素
+                    item = FlowchartItem(item_type, x, y, width, height)
+                    item.id = item_data["id"]
 
-                # 手动更新连接点位置（解决加载文件后连接点位置不正确的问题）
-                item.update_connection_points()
+                    # 设置文本
+                    item_text = item_data.get("text", "")
+                    item.setText(item_text)
+
+                    add_item(item)
+                    item_dict[item.id] = item
+                    created_items += 1
+
+                    # 调试：检查连接点是否正确创建
+                    if debug_enabled:
+                        logger.debug("加载元素 %d: ✓ ID=%s, 类型=%s, 位置=(%s, %s), 文本='%s', 连接点数量=%d",
+                                     i + 1, item.id, item_type, x, y, item_text, len(item.connection_points))
 
+                except Exception as e:
+                    failed_items += 1
+                    logger.debug("加载元素 %d: ✗ 创建元素失败: %r, 数据: %s", i + 1, e, item_data)
+                    if failed_items > _MAX_LOAD_ERRORS:
+                        break
+
+            # 所有元素加入场景后统一更新连接点（解决加载文件后连接点位置不正确的问题）
+            for item in item_dict.values():
+                item.update_connection_points()
                 # 确保连接点在最上层（但不要设置过高，以免影响事件处理）
                 for point in item.connection_points.values():
                     point.setZValue(10)  # 恢复到原始的z值
 
-                # 调试：检查连接点是否正确创建
-                logger.debug(f"  ✓ 成功创建元素: {item.id}")
-                logger.debug(f"  ✓ 元素类型: {item_type}")
-                logger.debug(f"  ✓ 元素位置: ({x}, {y})")
-                logger.debug(f"  ✓ 元素文本: '{item_text}'")
-                logger.debug(f"  ✓ 连接点数量: {len(item.connection_points)}")
-                logger.debug(f"  ✓ 元素类型属性: {item.item_type}")
-                logger.debug(f"  ✓ 文本项内容: '{item.text_item.toPlainText()}'")
-
-            except Exception as e:
-                logger.debug(f"  ✗ 创建元素失败: {e}")
-                import traceback
-                traceback.print_exc()
-
-        # 创建连接
-        logger.debug(f"\n=== 加载连接 ===")
-        # 先收集所有连接数据，稍后在所有元素都完全加载后创建连接
-        connections_to_create = []
-        for i, connection_data in enumerate(flowchart_data["connections"]):
-            logger.debug(f"\n收集连接数据 {i+1}:")
-            logger.debug(f"  数据: {connection_data}")
-            connections_to_create.append(connection_data)
+            # 创建连接
+            logger.debug("\n=== 加载连接 ===")
+            # 先收集所有连接数据，稍后在所有元素都完全加载后创建连接
+            connections_to_create = list(flowchart_data["connections"])
         
-        logger.debug(f"\n=== 所有元素加载完成，开始创建连接 ===")
-        logger.debug(f"连接数量: {len(connections_to_create)}")
+            logger.debug("\n=== 所有元素加载完成，开始创建连接 ===")
+            logger.debug("连接数量: %d", len(connections_to_create))
         
-        # 延迟创建连接，确保所有元素都已完全加载
-        for i, connection_data in enumerate(connections_to_create):
-            logger.debug(f"\n创建连接 {i+1}:")
-            logger.debug(f"  数据: {connection_data}")
-
-            try:
-                start_item_id = connection_data["start_item_id"]
-                start_point_type = connection_data["start_point_type"]
-                end_item_id = connection_data["end_item_id"]
-                end_point_type = connection_data["end_point_type"]
-
-                # 查找起始和结束元素
-                if start_item_id in item_dict and end_item_id in item_dict:
-                    start_item = item_dict[start_item_id]
-                    end_item = item_dict[end_item_id]
-
-                    logger.debug(f"  ✓ 找到起始元素: {start_item_id}")
-                    logger.debug(f"  ✓ 找到结束元素: {end_item_id}")
-
-                    # 创建连接线
-                    connection = ConnectionLine(
-                        start_item,
-                        start_point_type,
-                        end_item,
-                        end_point_type
-                    )
-                    scene.addItem(connection)
-                    scene.connections.append(connection)
-
-                    # 恢复标签信息
-                    if "label" in connection_data and connection_data["label"]:
-                        connection.label = connection_data["label"]
-                        connection.create_label()
-
-                    logger.debug(f"  ✓ 成功创建连接")
-                    if connection.label:
-                        logger.debug(f"    - 标签: {connection.label}")
-                else:
-                    logger.debug(f"  ✗ 找不到连接的元素")
-                    logger.debug(f"    - 起始元素ID: {start_item_id} {'存在' if start_item_id in item_dict else '不存在'}")
-                    logger.debug(f"    - 结束元素ID: {end_item_id} {'存在' if end_item_id in item_dict else '不存在'}")
-
-            except Exception as e:
-                logger.debug(f"  ✗ 创建连接失败: {e}")
-                import traceback
-                traceback.print_exc()
-
-        # 在所有连接创建完成后，立即更新所有连接的路径
-        logger.debug("\n=== 更新所有连接路径 ===")
-        for connection in scene.connections:
-            connection.update_path()
-        logger.debug("✓ 所有连接路径已更新")
-        
-        # 禁用批量加载模式
-        if hasattr(scene, 'batch_loading'):
-            scene.batch_loading = False
-            logger.debug("✓ 禁用批量加载模式")
+            # 延迟创建连接，确保所有元素都已完全加载；出错过多时不再继续
+            if failed_items > _MAX_LOAD_ERRORS:
+                connections_to_create = []
+            for i, connection_data in enumerate(connections_to_create):
+                try:
+                    start_item_id = connection_data["start_item_id"]
+                    start_point_type = connection_data["start_point_type"]
+                    end_item_id = connection_data["end_item_id"]
+                    end_point_type = connection_data["end_point_type"]
+
+                    # 查找起始和结束元素（get 一次查找，避免先 in 再取值）
+                    start_item = item_dict.get(start_item_id)
+                    end_item = item_dict.get(end_item_id)
+                    if start_item is not None and end_item is not None:
+                        # 创建连接线
+                        connection = ConnectionLine(
+                            start_item,
+                            start_point_type,
+                            end_item,
+                            end_point_type
+                        )
+                        add_item(connection)
+                        append_connection(connection)
+                        created_connections += 1
+
+                        # 恢复标签信息
+                        label = connection_data.get("label")
+                        if label:
+                            connection.label = label
+                            connection.create_label()
+
+                        if debug_enabled:
+                            logger.debug("创建连接 %d: ✓ %s.%s -> %s.%s, 标签: %s", i + 1,
+                                         start_item_id, start_point_type, end_item_id, end_point_type, connection.label)
+                    elif debug_enabled:
+                        logger.debug("创建连接 %d: ✗ 找不到连接的元素 - 起始元素ID: %s %s, 结束元素ID: %s %s", i + 1,
+                                     start_item_id, '存在' if start_item is not None else '不存在',
+                                     end_item_id, '存在' if end_item is not None else '不存在')
+
+                except Exception as e:
+                    failed_connections += 1
+                    logger.debug("创建连接 %d: ✗ 创建连接失败: %r, 数据: %s", i + 1, e, connection_data)
+                    if failed_items + failed_connections > _MAX_LOAD_ERRORS:
+                        break
+
+            # 逐项失败只在调试级别记录，这里汇总一次，避免非调试级别下静默丢失内容；
+            # 跳过的数量包括创建失败、找不到两端元素以及停止加载后未处理的部分
+            skipped_items = len(flowchart_data["items"]) - created_items
+            skipped_connections = len(flowchart_data["connections"]) - created_connections
+            if skipped_items or skipped_connections:
+                aborted = failed_items + failed_connections > _MAX_LOAD_ERRORS
+                logger.warning("加载流程图时跳过了 %d 个元素、%d 条连接%s", skipped_items, skipped_connections,
+                               f"（出错超过{_MAX_LOAD_ERRORS}处，已停止加载，文件可能已损坏）" if aborted else "")
+
+            # 在所有连接创建完成后，立即更新所有连接的路径
+            logger.debug("\n=== 更新所有连接路径 ===")
+            if hasattr(scene, 'relayout_all'):
+                scene.relayout_all()
+            else:
+                for connection in scene.connections:
+                    connection.update_path()
+            logger.debug("✓ 所有连接路径已更新")
+        finally:
+            scene.blockSignals(False)
+            if view is not None:
+                view.setUpdatesEnabled(True)
+                view.viewport().update()
+            # 禁用批量加载模式（加载中途出错也要恢复，否则之后添加的元素不会再扩展画布）
+            if hasattr(scene, 'batch_loading'):
+                scene.batch_loading = False
+                logger.debug("✓ 禁用批量加载模式")
         
-        # 更新画布大小以适应加载的元素
+        # 更新画布大小以适应加载的元素（批量加载期间跳过的更新在此统一完成一次）
         if hasattr(scene, 'update_scene_bounds'):
             scene.update_scene_bounds()
             logger.debug("✓ 画布大小已更新")
@@ -372,8 +402,8 @@ def load_flowchart(scene, parent_window, file_path=None):
             view = parent_window.view
             # 获取场景的实际边界（包含所有元素）
             scene_rect = scene.sceneRect()
-            logger.debug(f"场景边界: x={scene_rect.x():.0f}, y={scene_rect.y():.0f}, "
-                        f"w={scene_rect.width():.0f}, h={scene_rect.height():.0f}")
+            logger.debug("场景边界: x=%.0f, y=%.0f, w=%.0f, h=%.0f",
+                         scene_rect.x(), scene_rect.y(), scene_rect.width(), scene_rect.height())
             
             # 重置视图变换
             view.resetTransform()
@@ -386,19 +416,21 @@ def load_flowchart(scene, parent_window, file_path=None):
             
             logger.debug("✓ 视图已适应场景范围")
         
-        # 验证加载结果
-        logger.debug(f"\n=== 加载结果 ===")
-        logger.debug(f"创建的元素数量: {len(item_dict)}")
-        logger.debug(f"创建的连接数量: {len(scene.connections)}")
-        logger.debug(f"场景中的项目数量: {len(scene.items())}")
-
-        # 检查场景中的项目类型
-        item_types = {}
-        for item in scene.items():
-            item_class = item.__class__.__name__
-            item_types[item_class] = item_types.get(item_class, 0) + 1
-
-        logger.debug(f"场景中的项目类型: {item_types}")
+        # 验证加载结果（仅调试级别开启时统计）
+        if debug_enabled:
+            logger.debug("\n=== 加载结果 ===")
+            logger.debug("创建的元素数量: %d", len(item_dict))
+            logger.debug("创建的连接数量: %d", len(scene.connections))
+            # 单次遍历场景项目，同时得到数量与类型分布
+            item_types = {}
+            scene_item_count = 0
+            for item in scene.items():
+                scene_item_count += 1
+                item_class = item.__class__.__name__
+                item_types[item_class] = item_types.get(item_class, 0) + 1
+
+            logger.debug("场景中的项目数量: %d", scene_item_count)
+            logger.debug("场景中的项目类型: %s", item_types)
         
         # 显示成功消息
         success_msg = f"流程图已成功从:\n{file_path} 加载\n\n"
@@ -411,7 +443,7 @@ def load_flowchart(scene, parent_window, file_path=None):
         return True
 
     except Exception as e:
-        logger.debug(f"✗ 加载流程整体失败: {e}")
+        logger.debug("✗ 加载流程整体失败: %s", e)
         import traceback
         traceback.print_exc()
         QMessageBox.warning(parent_window, "加载失败", f"加载文件时出错:\n{str(e)}")
@@ -0,0 +1,48 @@
+"""
+JSON读写工具 - 优先使用 orjson 加速大文件的序列化与解析，未安装时回退到标准库 json
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖
+    orjson = None
+
+
+def loads_json(text):
+    """解析JSON文本（str 或 bytes）"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def load_json(f):
+    """从已打开的文件对象读取并解析JSON"""
+    return loads_json(f.read())
+
+
+def dumps_json(obj, indent=True):
+    """
+    序列化为JSON字符串，非ASCII字符原样保留
+
+    Args:
+        obj: 待序列化对象
+        indent: 是否使用两空格缩进；为False时输出紧凑格式
+
+    Returns:
+        str: JSON文本
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode('utf-8')
+        except TypeError:
+            # orjson 不支持的类型（如超出64位的整数、非字符串键）交给标准库处理
+            pass
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def dump_json(obj, f, indent=True):
+    """序列化并写入已打开的文本文件对象"""
+    f.write(dumps_json(obj, indent=indent))
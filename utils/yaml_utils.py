@@ -0,0 +1,38 @@
+"""
+YAML读写工具 - 解析优先使用 libyaml 的 C 实现（CSafeLoader），PyYAML 未编译 libyaml 时
+回退到纯 Python 的 SafeLoader
+
+yaml 模块在第一次读写时才导入，只引用本模块而不读写配置的代码无需承担导入开销。
+"""
+
+__all__ = ['load_yaml', 'dump_yaml']
+
+# 首次使用时填充：(yaml 模块, 解析用 Loader, 写出用 Dumper)
+_yaml_api = None
+
+
+def _get_yaml_api():
+    """导入 yaml 并选择 Loader/Dumper，结果缓存供后续调用复用"""
+    global _yaml_api
+    if _yaml_api is None:
+        import yaml
+        try:
+            from yaml import CSafeLoader as loader
+        except ImportError:  # PyYAML 未附带 libyaml 扩展
+            loader = yaml.SafeLoader
+        # 写出仍使用纯 Python 的 SafeDumper：libyaml 的发射器会把表情符号等非BMP字符转义成
+        # "\U0001F4A1"，配置文件需要保持可读；写配置只在修改设置时发生，不在热路径上
+        _yaml_api = (yaml, loader, yaml.SafeDumper)
+    return _yaml_api
+
+
+def load_yaml(f):
+    """从已打开的文件对象（或字符串）解析YAML"""
+    yaml, loader, _ = _get_yaml_api()
+    return yaml.load(f, Loader=loader)
+
+
+def dump_yaml(data, f):
+    """将配置写入已打开的文本文件对象，保留中文与键的原有顺序"""
+    yaml, _, dumper = _get_yaml_api()
+    yaml.dump(data, f, Dumper=dumper, allow_unicode=True, default_flow_style=False, sort_keys=False)